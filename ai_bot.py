@@ -141,7 +141,7 @@ class AIBot:
             # Place TNT and immediately set flee target
             if not self.tnt_placed:
                 self.player.move_direction = 0
-                self.world.spawn_tnt(self.player.x, self.player.y, fuse_time=2.5, power_level=self.player.tnt_power_level)
+                self.world.tnt_spawner.request(self.player.x, self.player.y, fuse_time=2.5, power_level=self.player.tnt_power_level)
                 self.tnt_placed = True
                 self.tnt_cooldown = 8.0  # Wait 8 seconds before next TNT
                 print("[AI BOT] Placed TNT! Fleeing...")
@@ -180,10 +180,8 @@ class AIBot:
                 
                 player_block_y = int(self.player.y // BLOCK_SIZE)
                 # Only jump if there's actually a block in the way
-                if 0 <= check_x < CHUNK_WIDTH and 0 <= player_block_y < WORLD_HEIGHT:
-                    block = self.world.get_block(check_x, player_block_y)
-                    if block and block != 'air':
-                        self.player.jump()
+                if self.world.solid_grid.is_solid(check_x, player_block_y):
+                    self.player.jump()
 
         # If exploring and reached target, pick a new wander target to keep moving
         if self.state == 'explore' and abs(dx) <= 5:
@@ -228,43 +226,15 @@ class AIBot:
         # Check ahead based on movement direction
         check_x = player_block_x + (1 if self.player.move_direction > 0 else -1)
         
-        if 0 <= check_x < CHUNK_WIDTH and 0 <= player_block_y < WORLD_HEIGHT:
-            block = self.world.get_block(check_x, player_block_y)
-            return block and block != 'air'
-        
-        return False
+        return self.world.solid_grid.is_solid(check_x, player_block_y)
     
     def find_nearest_tnt(self):
         """Find the nearest TNT entity"""
-        if not self.world.tnt_list:
-            return None
-        
-        nearest = None
-        min_distance = float('inf')
-        
-        for tnt in self.world.tnt_list:
-            distance = math.sqrt((tnt.x - self.player.x)**2 + (tnt.y - self.player.y)**2)
-            if distance < min_distance:
-                min_distance = distance
-                nearest = tnt
-        
-        return nearest
+        return self.world.tnt_hash.nearest(self.player.x, self.player.y)
     
     def find_nearest_item(self):
         """Find the nearest collectible item"""
-        if not self.world.items:
-            return None
-        
-        nearest = None
-        min_distance = float('inf')
-        
-        for item in self.world.items:
-            distance = math.sqrt((item.x - self.player.x)**2 + (item.y - self.player.y)**2)
-            if distance < min_distance:
-                min_distance = distance
-                nearest = item
-        
-        return nearest
+        return self.world.item_hash.nearest(self.player.x, self.player.y)
     
     def toggle(self):
         """Toggle AI bot on/off"""
@@ -2,7 +2,8 @@
 Block class and block-related functionality
 """
 
-from constants import BLOCK_HARDNESS, BLOCK_COLORS
+import numpy as np
+from constants import BLOCK_HARDNESS, BLOCK_COLORS, BLOCK_TYPES
 
 class Block:
     """Represents a single block in the world"""
@@ -57,3 +58,11 @@ class Block:
     
     def __repr__(self):
         return f"Block({self.type}, hp={self.health:.1f})"
+
+
+# Undamaged blocks share one instance per type (indexed by block id, air is None).
+# A block gets its own instance once it is damaged (see World.mine_block_at).
+SHARED_BLOCKS = [None] + [Block(block_type) for block_type in BLOCK_TYPES[1:]]
+
+# Lookup table indexed by block id: does this block stop movement? (see Block.is_solid)
+SOLID_LUT = np.array([block_type not in ['air', 'water', 'lava'] for block_type in BLOCK_TYPES])
@@ -0,0 +1,166 @@
+"""
+Grid collision against a solid-cell map of the world
+The map is kept in sync through block listeners; moving boxes walk it cell by
+cell (DDA) along their motion, so no step size - however large dt gets - can
+carry them through a solid block
+"""
+
+import numpy as np
+from block import SOLID_LUT
+from constants import BLOCK_SIZE
+
+EPSILON = 1e-6  # A box edge exactly on a cell boundary does not cover the next cell
+PUSH_BUFFER = 0.1  # Extra pixels a resolved box is pushed clear of a block
+
+def _cell_span(low, size):
+    """First and last grid cell covered by an interval"""
+    return int(low // BLOCK_SIZE), int((low + size - EPSILON) // BLOCK_SIZE)
+
+class SolidGrid:
+    """One byte per cell (1 = solid), same column-major layout as World.block_bytes"""
+
+    def __init__(self, world):
+        self.width = world.width
+        self.height = world.height
+        self.cells = bytearray(self.width * self.height)  # Fast single-cell and column reads
+        self.grid = np.frombuffer(self.cells, dtype=np.uint8).reshape(self.width, self.height)
+        self.grid[:] = SOLID_LUT[world.block_grid]
+        self.world = world
+
+    def on_blocks_changed(self, xs, ys):
+        """Block listener - refresh changed cells"""
+        self.grid[xs, ys] = SOLID_LUT[self.world.block_grid[xs, ys]]
+
+    def is_solid(self, grid_x, grid_y):
+        """Check one grid cell (outside the world counts as empty)"""
+        if 0 <= grid_x < self.width and 0 <= grid_y < self.height:
+            return self.cells[grid_x * self.height + grid_y] == 1
+        return False
+
+    def solid_at(self, xs, ys):
+        """
+        Solid test for arrays of pixel positions
+        Returns (solid, grid_xs, grid_ys) - outside the world counts as empty
+        """
+        grid_xs = (xs // BLOCK_SIZE).astype(np.intp)
+        grid_ys = (ys // BLOCK_SIZE).astype(np.intp)
+        inside = (grid_xs >= 0) & (grid_xs < self.width) & (grid_ys >= 0) & (grid_ys < self.height)
+        solid = np.zeros(len(xs), dtype=bool)
+        solid[inside] = self.grid[grid_xs[inside], grid_ys[inside]]
+        return solid, grid_xs, grid_ys
+
+    def any_solid(self, x, y, width, height):
+        """Is any solid cell overlapped by a pixel rectangle?"""
+        first_col, last_col = _cell_span(x, width)
+        first_row, last_row = _cell_span(y, height)
+        first_col, last_col = max(0, first_col), min(self.width - 1, last_col)
+        first_row, last_row = max(0, first_row), min(self.height - 1, last_row)
+        if first_row > last_row:
+            return False
+
+        # Each column's rows are contiguous - test them as one slice
+        for col in range(first_col, last_col + 1):
+            start = col * self.height
+            if 1 in self.cells[start + first_row:start + last_row + 1]:
+                return True
+        return False
+
+    def resolve_aabb(self, x, y, width, height):
+        """
+        Push a box out of the solid cells it overlaps (shallowest axis first)
+        Returns (x, y, push_x, push_y) - push is the direction moved (-1, 0 or 1)
+        """
+        push_x = push_y = 0
+        if not self.any_solid(x, y, width, height):
+            return x, y, push_x, push_y  # Usual case - nothing to resolve
+
+        first_col, last_col = _cell_span(x, width)
+        first_row, last_row = _cell_span(y, height)
+        for row in range(max(0, first_row), min(self.height, last_row + 1)):
+            top = row * BLOCK_SIZE
+            for col in range(max(0, first_col), min(self.width, last_col + 1)):
+                if self.cells[col * self.height + row] != 1:
+                    continue
+
+                # Overlap with this cell (the box may already have been pushed)
+                left = col * BLOCK_SIZE
+                overlap_x = min(x + width - left, left + BLOCK_SIZE - x)
+                overlap_y = min(y + height - top, top + BLOCK_SIZE - y)
+                if overlap_x <= 0 or overlap_y <= 0:
+                    continue
+
+                if overlap_x < overlap_y:
+                    # Push horizontally
+                    if x + width / 2 < left + BLOCK_SIZE / 2:
+                        x -= overlap_x + PUSH_BUFFER
+                        push_x = -1
+                    else:
+                        x += overlap_x + PUSH_BUFFER
+                        push_x = 1
+                else:
+                    # Push vertically
+                    if y + height / 2 < top + BLOCK_SIZE / 2:
+                        y -= overlap_y + PUSH_BUFFER
+                        push_y = -1
+                    else:
+                        y += overlap_y + PUSH_BUFFER
+                        push_y = 1
+
+        return x, y, push_x, push_y
+
+    def sweep(self, x, y, width, height, dx, dy):
+        """
+        Move a box by (dx, dy) in pixels, stopping each axis at the first solid cell
+        Returns (x, y, hit_x, hit_y) - hit is the blocked direction (-1, 0 or 1)
+        """
+        hit_x = hit_y = 0
+        first_col, last_col = _cell_span(x, width)
+        first_row, last_row = _cell_span(y, height)
+        lead_col = last_col if dx > 0 else first_col  # Column the leading edge is in
+        lead_row = last_row if dy > 0 else first_row
+        remaining = 1.0  # Fraction of the move still to go
+
+        while remaining > 0:
+            # Fraction of (dx, dy) until the leading edges enter the next column / row
+            if dx > 0:
+                to_x = ((lead_col + 1) * BLOCK_SIZE - (x + width)) / dx
+            elif dx < 0:
+                to_x = (lead_col * BLOCK_SIZE - x) / dx
+            else:
+                to_x = float('inf')
+            if dy > 0:
+                to_y = ((lead_row + 1) * BLOCK_SIZE - (y + height)) / dy
+            elif dy < 0:
+                to_y = (lead_row * BLOCK_SIZE - y) / dy
+            else:
+                to_y = float('inf')
+
+            step = max(0.0, min(to_x, to_y))
+            if step >= remaining:
+                x += dx * remaining
+                y += dy * remaining
+                break
+            x += dx * step
+            y += dy * step
+            remaining -= step
+
+            if to_x <= to_y:
+                # Entering a new column - blocked if any cell the box spans there is solid
+                col = lead_col + (1 if dx > 0 else -1)
+                if self.any_solid(col * BLOCK_SIZE, y, BLOCK_SIZE, height):
+                    x = col * BLOCK_SIZE - width if dx > 0 else (col + 1) * BLOCK_SIZE
+                    hit_x = 1 if dx > 0 else -1
+                    dx = 0  # Keep sliding along the other axis
+                else:
+                    lead_col = col
+            else:
+                # Entering a new row
+                row = lead_row + (1 if dy > 0 else -1)
+                if self.any_solid(x, row * BLOCK_SIZE, width, BLOCK_SIZE):
+                    y = row * BLOCK_SIZE - height if dy > 0 else (row + 1) * BLOCK_SIZE
+                    hit_y = 1 if dy > 0 else -1
+                    dy = 0
+                else:
+                    lead_row = row
+
+        return x, y, hit_x, hit_y
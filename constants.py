@@ -32,8 +32,94 @@ TNT_SPAWN_INTERVAL = 5.0  # Base seconds between TNT spawns
 TNT_MIN_FUSE = 2.0  # Minimum fuse time
 TNT_MAX_FUSE = 3.5  # Maximum fuse time
 TNT_KNOCKBACK_FORCE = 150  # Knockback strength (reduced from 300)
+TNT_REST_SPEED = 1.0  # pixels per second - slower sideways drift stops (back to the cheap straight-drop path)
 TNT_BASE_SPAWN_CHANCE = 0.3  # 30% base chance per spawn check
 TNT_DEPTH_MULTIPLIER = 0.02  # +2% per 10m depth
+EXPLOSION_MAX_ORE_DROPS = 6  # Ore items dropped per crater at most
+BLAST_RESISTANCE_SCALE = 0.5  # blast energy a block absorbs per point of hardness
+BLAST_RAY_STEP = 0.25  # blocks between samples along a blast ray
+
+# Explosion batching (every detonation in a frame is resolved together)
+TNT_CHAIN_RADIUS = TNT_EXPLOSION_RADIUS + 1  # blocks - TNT this close detonates in the same frame
+TNT_PUSH_RADIUS = TNT_EXPLOSION_RADIUS + 3  # blocks - TNT this close is knocked away
+EXPLOSION_BATCH_PARTICLES = 150  # max fire particles per batch
+EXPLOSION_BATCH_ANIMATIONS = 6  # max explosion animations per batch
+EXPLOSION_SUBVARIANTS = 3  # seeded looks per explosion variation (frames shared by all)
+EXPLOSION_WORK_BUDGET_MS = 3.0  # per-frame time for deferred cosmetic explosion work
+
+# TNT admission control (floods are queued, merged or dropped)
+MAX_SIMULTANEOUS_TNT = 50  # live TNT at most
+TNT_SPAWN_QUEUE_LIMIT = 100  # waiting requests at most - further ones are dropped
+TNT_MERGE_RADIUS = 3  # blocks - waiting requests this close merge into one stronger TNT
+TNT_MAX_MERGED_POWER = 10  # power level a merged TNT can reach
+
+# Spatial hash (TNT and items bucketed by position for nearby lookups)
+SPATIAL_HASH_CELL_SIZE = TNT_PUSH_RADIUS * BLOCK_SIZE  # pixels - entity lookup bucket size
+
+# Object pools (released entities are reused instead of reallocated)
+OBJECT_POOL_LIMIT = 256  # free objects kept per entity type
+
+# Update level of detail (entities far outside the view tick less often, with the dt they missed)
+UPDATE_LOD_TIERS = ((BLOCK_SIZE * 16, 2), (BLOCK_SIZE * 48, 4))  # (pixels outside the view, update every Nth frame)
+
+# Item stacking (identical drops resting close together merge into one stack)
+ITEM_STACK_RADIUS = BLOCK_SIZE * 2  # pixels between resting items that merge
+ITEM_STACK_MAX = 99  # items per stack
+
+# Particle system (array-backed debris and spark particles)
+PARTICLE_CAPACITY = 4096  # preallocated particle slots (grows if ever exceeded)
+
+# Particle budget (emission thins out by priority and visibility as the budget fills)
+PARTICLE_BUDGET = 2000  # live particles the world aims to stay under
+PARTICLE_GAMEPLAY = 'gameplay'  # priority: feedback for player actions (mining, pickups)
+PARTICLE_EFFECT = 'effect'  # priority: explosions and debris
+PARTICLE_AMBIENT = 'ambient'  # priority: decoration (meteors, sparkles)
+PARTICLE_PRIORITY_THINNING = {  # budget fill at which each priority starts thinning out
+    PARTICLE_GAMEPLAY: 0.9,
+    PARTICLE_EFFECT: 0.6,
+    PARTICLE_AMBIENT: 0.3,
+}
+PARTICLE_OFFSCREEN_EMISSION = {  # share of particles emitted by off-screen emitters
+    PARTICLE_GAMEPLAY: 0.5,
+    PARTICLE_EFFECT: 0.25,
+    PARTICLE_AMBIENT: 0.0,
+}
+PARTICLE_OFFSCREEN_MARGIN = 64  # pixels around the screen still counted as visible
+PARTICLE_OFFSCREEN_AGING = 3.0  # off-screen particles age this much faster
+
+# Particle collision and decals (particles bounce off blocks and settle into fading squares)
+PARTICLE_BOUNCE = 0.3  # share of speed kept when a particle bounces off a block
+PARTICLE_FRICTION = 0.6  # share of sliding speed kept on each ground bounce
+PARTICLE_SETTLE_SPEED = 40  # pixels per second - slower bounces settle into decals
+PARTICLE_DECAL_CAPACITY = 1024  # settled particles kept (oldest overwritten)
+PARTICLE_DECAL_LIFETIME = 3.0  # seconds a settled particle takes to fade out
+
+# Particle rendering (one batched blit from cached sprites)
+PARTICLE_ALPHA_BUCKETS = 16  # fade steps a particle sprite is drawn with
+PARTICLE_SPRITE_CACHE_SIZE = 2048  # cached particle sprites (color, size, fade step)
+
+# Effect pools (meteor trails, item sparkles, snow and shooting stars)
+EFFECT_POOL_CAPACITY = 2048  # decorative effects (trails, sparkles, snow) per pool
+
+# Debris particles (crater cells are grouped instead of emitting per block)
+DEBRIS_REGION_SIZE = 4  # blocks per debris group side
+DEBRIS_PARTICLES_PER_BLOCK = 3  # density for small craters
+DEBRIS_MAX_PARTICLES = 300  # cap per explosion batch
+
+# Falling blocks (loose blocks drop when their support is removed)
+LOOSE_BLOCKS = ['sand', 'red_sand', 'soul_sand']
+FALLING_BLOCK_STEP = 0.05  # seconds between fall steps (one block per step)
+FALLING_BLOCK_BATCH = 256  # max columns resolved per step
+
+# Lighting
+LIGHT_CHUNK_SIZE = 16  # blocks per light chunk side
+MAX_LIGHT = 15  # brightest light level (full daylight)
+LIGHT_DEPTH_FALLOFF = 3  # blocks below stone start per lost ambient level
+NETHER_AMBIENT_LIGHT = 5  # dim red glow everywhere in the Nether
+DARKNESS_MAX_ALPHA = 225  # overlay alpha at light level 0
+PLAYER_LIGHT_RADIUS = 6  # blocks lit around the player
+EXPLOSION_LIGHT_RADIUS = 12  # blocks lit by a fresh explosion
+LIGHT_OVERLAY_CACHE_SIZE = 96  # cached chunk overlays kept by the renderer
 
 # Block definitions with Minecraft-like colors
 BLOCK_COLORS = {
@@ -111,6 +197,16 @@ BLOCK_HARDNESS = {
     'packed_ice': 1.5,
 }
 
+# Numeric block ids for array storage (air is always 0)
+BLOCK_TYPES = list(BLOCK_COLORS.keys())
+BLOCK_IDS = {block_type: i for i, block_type in enumerate(BLOCK_TYPES)}
+
+# Light emitted by glowing blocks
+LIGHT_EMITTERS = {
+    'glowstone': 15,
+    'lava': 13,
+}
+
 # Ore spawn rates (chance per block at appropriate depth)
 ORE_SPAWN_RATES = {
     'coal': 0.15,      # 15% at depth 10+ (very common)
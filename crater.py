@@ -0,0 +1,128 @@
+"""
+Vectorized explosion craters
+Blast energy is ray-marched outward from the center and soaked up by the
+hardness of every block it passes, so soft ground blows open wider than
+stone and hard ores shield whatever lies behind them
+"""
+
+import math
+import numpy as np
+from constants import BLOCK_TYPES, BLOCK_HARDNESS, BLAST_RESISTANCE_SCALE, BLAST_RAY_STEP
+
+# Lookup table indexed by block id: can an explosion destroy this block?
+MINEABLE_LUT = np.array([block_type != 'air' and BLOCK_HARDNESS.get(block_type, 1.0) < float('inf')
+                         for block_type in BLOCK_TYPES])
+
+# Lookup table indexed by block id: blast energy a block absorbs (huge = unbreakable)
+RESISTANCE_LUT = np.array([min(BLOCK_HARDNESS.get(block_type, 1.0) * BLAST_RESISTANCE_SCALE, 1e6)
+                           for block_type in BLOCK_TYPES], dtype=np.float32)
+
+# Solid stone should still give a crater of exactly the nominal radius
+STONE_RESISTANCE = BLOCK_HARDNESS['stone'] * BLAST_RESISTANCE_SCALE
+
+class CraterEngine:
+    """Carves hardness-dependent craters into the world's block grid"""
+
+    def __init__(self):
+        self.rays = {}  # radius -> (dx, dy, dist, valid) arrays, shape (rays, steps)
+
+    def get_power(self, radius):
+        """Blast energy for a nominal radius (calibrated on solid stone)"""
+        # A stone cell at distance d is reached with power - d - (d - 1) * r energy
+        # and breaks when that exceeds r, i.e. while d < power / (1 + r)
+        return (radius + 0.5) * (1 + STONE_RESISTANCE)
+
+    def get_rays(self, radius):
+        """Get (cached) cell offsets along every blast ray for a radius"""
+        rays = self.rays.get(radius)
+        if rays is not None:
+            return rays
+
+        # Rays can reach until distance alone has used up the energy
+        reach = int(math.ceil(self.get_power(radius)))
+        count = max(8, int(math.ceil(2 * math.pi * reach * 1.5)))  # Enough rays to touch every edge cell
+        steps = np.arange(0, reach + BLAST_RAY_STEP, BLAST_RAY_STEP)
+
+        cells = []
+        for i in range(count):
+            angle = 2 * math.pi * i / count
+            xs = np.rint(np.cos(angle) * steps).astype(np.intp)
+            ys = np.rint(np.sin(angle) * steps).astype(np.intp)
+
+            # Drop repeated samples so each cell is crossed once per ray
+            keep = np.ones(len(xs), dtype=bool)
+            keep[1:] = (xs[1:] != xs[:-1]) | (ys[1:] != ys[:-1])
+            cells.append((xs[keep], ys[keep]))
+
+        length = max(len(xs) for xs, ys in cells)
+        dx = np.zeros((count, length), dtype=np.intp)
+        dy = np.zeros((count, length), dtype=np.intp)
+        valid = np.zeros((count, length), dtype=bool)
+        for i, (xs, ys) in enumerate(cells):
+            dx[i, :len(xs)] = xs
+            dy[i, :len(ys)] = ys
+            valid[i, :len(xs)] = True
+        dist = np.sqrt(dx * dx + dy * dy).astype(np.float32)
+
+        rays = (dx, dy, dist, valid)
+        self.rays[radius] = rays
+        return rays
+
+    def carve(self, world, center_x, center_y, radius):
+        """
+        Blast outward from the center cell with energy for the given radius
+        Returns dict with destroyed cell coords ('xs', 'ys'), block ids ('ids')
+        and per-type counts ('counts')
+        """
+        return self.carve_many(world, [(center_x, center_y)], radius)
+
+    def carve_many(self, world, centers, radius):
+        """Blast from several centers at once and destroy the union of their craters"""
+        dx, dy, dist, valid = self.get_rays(radius)
+        power = self.get_power(radius)
+        grid = world.block_grid
+
+        # Every ray of every center in one (centers, rays, steps) batch
+        center_xs = np.array([cx for cx, cy in centers], dtype=np.intp)[:, np.newaxis, np.newaxis]
+        center_ys = np.array([cy for cx, cy in centers], dtype=np.intp)[:, np.newaxis, np.newaxis]
+        xs = dx + center_xs
+        ys = dy + center_ys
+        inside = valid & (xs >= 0) & (xs < world.width) & (ys >= 0) & (ys < world.height)
+        cells = xs * world.height + ys  # Flat grid index
+        cells[~inside] = 0
+
+        # Resistance of every cell along every ray (leaving the world stops a ray)
+        resistance = RESISTANCE_LUT[grid.ravel().take(cells)]
+        resistance[~inside] = 1e6
+
+        # Energy left on reaching each cell after distance falloff and
+        # everything the ray already broke through
+        spent = np.cumsum(resistance, axis=2) - resistance
+        energy = power - dist - spent
+
+        # A ray stops at the first cell it cannot break
+        broken = np.logical_and.accumulate(energy > resistance, axis=2)
+
+        # Union of all broken cells (scatter into a flat mask, cheaper than sorting)
+        hit = np.zeros(world.width * world.height, dtype=bool)
+        hit[cells[broken]] = True
+        xs, ys = np.divmod(np.flatnonzero(hit), world.height)
+        ids = grid[xs, ys]
+
+        # Only real blocks count (rays also "break" through air)
+        solid = MINEABLE_LUT[ids]
+        xs, ys, ids = xs[solid], ys[solid], ids[solid]
+
+        world.clear_blocks(xs, ys)
+
+        return {
+            'xs': xs,
+            'ys': ys,
+            'ids': ids,
+            'counts': self.count_types(ids),
+        }
+
+    def count_types(self, ids):
+        """Count destroyed blocks per type name"""
+        counts = np.bincount(ids, minlength=len(BLOCK_TYPES))
+        return {BLOCK_TYPES[i]: int(n) for i, n in enumerate(counts) if n}
@@ -0,0 +1,69 @@
+"""
+Debris aggregation for explosion craters
+Destroyed cells are grouped by block type and region, and each group gets a
+share of a capped particle budget instead of 8-12 particles per block
+"""
+
+import numpy as np
+from constants import (BLOCK_SIZE, BLOCK_TYPES, BLOCK_COLORS, DEBRIS_REGION_SIZE,
+                       DEBRIS_MAX_PARTICLES, DEBRIS_PARTICLES_PER_BLOCK, PARTICLE_EFFECT)
+
+class DebrisAggregator:
+    """Turns a crater's destroyed cells into a representative set of debris"""
+
+    def aggregate(self, xs, ys, ids):
+        """
+        Group destroyed cells by (block type, region)
+        Returns list of (center_x, center_y, block_type, block_count) in world
+        pixels, largest groups first
+        """
+        if len(xs) == 0:
+            return []
+
+        # One integer key per (type, region x, region y)
+        region_xs = xs // DEBRIS_REGION_SIZE
+        region_ys = ys // DEBRIS_REGION_SIZE
+        keys = (ids.astype(np.int64) * (region_xs.max() + 1) + region_xs) * (region_ys.max() + 1) + region_ys
+        unique_keys, inverse, counts = np.unique(keys, return_inverse=True, return_counts=True)
+
+        # Group centroids (cell centers, in pixels)
+        center_xs = (np.bincount(inverse, weights=xs) / counts + 0.5) * BLOCK_SIZE
+        center_ys = (np.bincount(inverse, weights=ys) / counts + 0.5) * BLOCK_SIZE
+        first = np.zeros(len(unique_keys), dtype=np.intp)
+        first[inverse] = np.arange(len(inverse))  # Any member - all share the type
+        group_ids = ids[first]
+
+        order = np.argsort(-counts, kind='stable')
+        return [(float(center_xs[i]), float(center_ys[i]), BLOCK_TYPES[group_ids[i]], int(counts[i]))
+                for i in order]
+
+    def get_budget(self, groups, particles):
+        """Particles to spend on a crater: capped, then thinned by the global particle budget"""
+        if not groups:
+            return 0
+        blocks = sum(count for _, _, _, count in groups)
+        center_x, center_y = groups[0][:2]  # Largest group
+        return particles.admit(min(blocks * DEBRIS_PARTICLES_PER_BLOCK, DEBRIS_MAX_PARTICLES),
+                               PARTICLE_EFFECT, center_x, center_y)
+
+    def emit(self, groups, budget, particles):
+        """Emit particles for groups, split by group size (at least one each while budget lasts)"""
+        blocks = sum(count for _, _, _, count in groups)
+        if not blocks:
+            return
+
+        spread = DEBRIS_REGION_SIZE * BLOCK_SIZE / 2
+        for center_x, center_y, block_type, count in groups:
+            if budget <= 0:
+                break
+            share = min(budget, max(1, round(budget * count / blocks)))
+            budget -= share
+            blocks -= count
+
+            # Few particles for many blocks - make each one chunkier
+            chunk = min(3, count // (share * 4))
+            color = BLOCK_COLORS.get(block_type, (255, 255, 255))
+            particles.emit(share,
+                           center_x + particles.rng.uniform(-spread, spread, share),
+                           center_y + particles.rng.uniform(-spread, spread, share),
+                           color, size=particles.rng.integers(2, 5, share) + chunk, priority=None)
@@ -0,0 +1,264 @@
+"""
+Decorative effect emitters
+Meteor trails, item sparkles, snow and shooting stars share array-backed
+effect pools: emitters spawn into a pool at their own rate, and the pool
+updates every effect in one step and draws them from cached sprites
+"""
+
+import math
+import random
+import pygame
+import numpy as np
+from constants import (SCREEN_WIDTH, SCREEN_HEIGHT, PARTICLE_ALPHA_BUCKETS, PARTICLE_SPRITE_CACHE_SIZE,
+                       EFFECT_POOL_CAPACITY)
+
+# Effect styles (how an effect moves and is drawn)
+STYLE_GLOW = 0  # Shrinking glow ball (meteor trails)
+STYLE_SPARKLE = 1  # Glow with a white center (item sparkles)
+STYLE_SNOW = 2  # Never expires, wraps around the screen
+STYLE_STREAK = 3  # Shooting star line
+
+class Emitter:
+    """Spawns effects into a pool at a steady (or jittered) interval"""
+
+    def __init__(self, spawn, min_interval, max_interval=None):
+        self.spawn = spawn  # callback(pool, count)
+        self.min_interval = min_interval
+        self.max_interval = max_interval if max_interval is not None else min_interval
+        self.reset()
+
+    def reset(self):
+        """Restart the timer (when the owner is reused)"""
+        self.timer = self._next_interval()
+
+    def _next_interval(self):
+        """Seconds until the next spawn"""
+        return random.uniform(self.min_interval, self.max_interval)
+
+    def update(self, dt, pool):
+        """Advance the timer and spawn everything that came due"""
+        self.timer -= dt
+        count = 0
+        while self.timer <= 0:
+            count += 1
+            self.timer += self._next_interval()
+        if count:
+            self.spawn(pool, count)
+
+class EffectPool:
+    """Struct-of-arrays store for short-lived effects in one coordinate space"""
+
+    FIELDS = {
+        'x': np.float64,
+        'y': np.float64,
+        'velocity_x': np.float64,
+        'velocity_y': np.float64,
+        'lifetime': np.float64,
+        'max_lifetime': np.float64,
+        'size': np.float64,
+        'length': np.float64,  # Streak length
+        'style': np.int64,
+    }
+
+    def __init__(self, capacity=EFFECT_POOL_CAPACITY):
+        self.capacity = capacity
+        self.count = 0  # Live effects occupy slots [0, count)
+        for name, dtype in self.FIELDS.items():
+            setattr(self, name, np.zeros(capacity, dtype=dtype))
+        self.color = np.zeros((capacity, 3), dtype=np.uint8)
+        self.sprites = {}  # Packed (style, color, size, alpha bucket) -> (Surface, half size)
+
+    def __len__(self):
+        return self.count
+
+    def emit(self, count, style, x, y, velocity_x, velocity_y, lifetime, max_lifetime, size, color, length=0):
+        """Add count effects - values are scalars or arrays of length count (extra ones are dropped when full)"""
+        count = min(count, self.capacity - self.count)
+        if count <= 0:
+            return
+
+        new = slice(self.count, self.count + count)
+        for name, value in (('x', x), ('y', y), ('velocity_x', velocity_x), ('velocity_y', velocity_y),
+                            ('lifetime', lifetime), ('max_lifetime', max_lifetime), ('size', size),
+                            ('length', length)):
+            getattr(self, name)[new] = value if np.ndim(value) == 0 else np.asarray(value)[:count]
+        self.style[new] = style
+        color = np.asarray(color)
+        self.color[new] = color if color.ndim == 1 else color[:count]
+        self.count += count
+
+    def update(self, dt):
+        """Move and age every effect, wrap snow and drop the expired"""
+        n = self.count
+        if not n:
+            return
+
+        self.x[:n] += self.velocity_x[:n] * dt
+        self.y[:n] += self.velocity_y[:n] * dt
+        style = self.style[:n]
+        self.lifetime[:n] -= np.where(style == STYLE_SNOW, 0.0, dt)  # Snow never expires
+
+        # Snow wraps around the screen
+        snow = style == STYLE_SNOW
+        if snow.any():
+            x, y = self.x[:n], self.y[:n]
+            below = snow & (y > SCREEN_HEIGHT)
+            y[below] = -10
+            x[below] = np.random.randint(0, SCREEN_WIDTH + 1, int(below.sum()))
+            x[snow & (x < 0)] = SCREEN_WIDTH
+            x[snow & (x > SCREEN_WIDTH)] = 0
+
+        # Shooting stars also end when they leave the bottom of the screen
+        fallen = (style == STYLE_STREAK) & (self.y[:n] > SCREEN_HEIGHT)
+        self.lifetime[:n][fallen] = 0
+
+        self._compact()
+
+    def _compact(self):
+        """Swap-remove expired effects (order is not kept)"""
+        n = self.count
+        dead = np.flatnonzero(self.lifetime[:n] <= 0)
+        if not len(dead):
+            return
+
+        # Live effects past the new end fill the dead slots before it
+        keep = n - len(dead)
+        holes = dead[dead < keep]
+        movers = keep + np.flatnonzero(self.lifetime[keep:n] > 0)
+        for name in self.FIELDS:
+            array = getattr(self, name)
+            array[holes] = array[movers]
+        self.color[holes] = self.color[movers]
+        self.count = keep
+
+    def render(self, screen, camera_x=0, camera_y=0):
+        """Draw every on-screen effect (sprites in one blits call, streaks as lines)"""
+        n = self.count
+        if not n:
+            return
+
+        screen_xs = (self.x[:n] - camera_x).astype(np.int64)
+        screen_ys = (self.y[:n] - camera_y).astype(np.int64)
+        style = self.style[:n]
+        fade = np.clip(self.lifetime[:n] / self.max_lifetime[:n], 0, 1)
+        fade[style == STYLE_SNOW] = 1.0
+
+        # Sprite styles - keyed by packed (style, color, drawn size, alpha bucket)
+        margin = 20
+        sprited = np.flatnonzero((style != STYLE_STREAK) &
+                                 (screen_xs >= -margin) & (screen_xs < SCREEN_WIDTH + margin) &
+                                 (screen_ys >= -margin) & (screen_ys < SCREEN_HEIGHT + margin))
+        if len(sprited):
+            sizes = self.size[sprited]
+            glow = style[sprited] == STYLE_GLOW
+            sizes[glow] *= fade[sprited][glow]  # Trails shrink as they fade
+            sizes = sizes.astype(np.int64)
+            colors = self.color[sprited].astype(np.int64)
+            buckets = (fade[sprited] * 255).astype(np.int64) * PARTICLE_ALPHA_BUCKETS // 256
+            keys = ((((style[sprited] << 24 | colors[:, 0] << 16 | colors[:, 1] << 8 | colors[:, 2])
+                      << 8) | sizes) << 8) | buckets
+            unique_keys, inverse = np.unique(keys, return_inverse=True)
+            sprites = [self._get_sprite(key) for key in unique_keys.tolist()]
+
+            blits = []
+            for i, screen_x, screen_y in zip(inverse.tolist(), screen_xs[sprited].tolist(),
+                                             screen_ys[sprited].tolist()):
+                sprite, half = sprites[i]
+                if sprite:
+                    blits.append((sprite, (screen_x - half, screen_y - half)))
+            screen.blits(blits, doreturn=False)
+
+        # Shooting stars (few) - drawn as lines
+        for i in np.flatnonzero(style == STYLE_STREAK).tolist():
+            self._render_streak(screen, screen_xs[i], screen_ys[i], self.velocity_x[i],
+                                self.velocity_y[i], self.length[i])
+
+    def _get_sprite(self, key):
+        """Get (cached) sprite and its half size for a packed key"""
+        cached = self.sprites.get(key)
+        if cached:
+            return cached
+
+        if len(self.sprites) >= PARTICLE_SPRITE_CACHE_SIZE:
+            self.sprites.clear()  # Rarely hit - cheaper than tracking use
+
+        bucket = key & 0xFF
+        size = (key >> 8) & 0xFF
+        color = ((key >> 32) & 0xFF, (key >> 24) & 0xFF, (key >> 16) & 0xFF)
+        style = key >> 40
+        alpha = (bucket * 2 + 1) * 128 // PARTICLE_ALPHA_BUCKETS  # Bucket middle
+
+        if style == STYLE_GLOW:
+            sprite = self._draw_glow(color, size, alpha)
+        elif style == STYLE_SPARKLE:
+            sprite = self._draw_sparkle(color, size, alpha)
+        else:
+            sprite = self._draw_snowflake(color, size)
+
+        cached = (sprite, sprite.get_width() // 2 if sprite else 0)
+        self.sprites[key] = cached
+        return cached
+
+    def _draw_glow(self, base_color, size, alpha):
+        """Glowing trail particle"""
+        if size <= 0:
+            return None
+        glow_surf = pygame.Surface((size * 3, size * 3), pygame.SRCALPHA)
+
+        # Outer glow
+        for r in range(size * 3, size, -1):
+            glow_alpha = int(alpha * (1 - (r - size) / (size * 2)))
+            color = (*base_color, glow_alpha)
+            pygame.draw.circle(glow_surf, color, (size * 3 // 2, size * 3 // 2), r)
+
+        # Core
+        core_color = tuple(min(255, c + 50) for c in base_color) + (alpha,)
+        pygame.draw.circle(glow_surf, core_color, (size * 3 // 2, size * 3 // 2), max(1, size))
+        return glow_surf
+
+    def _draw_sparkle(self, color, size, alpha):
+        """Sparkle with glow"""
+        sparkle_glow = pygame.Surface((12, 12), pygame.SRCALPHA)
+
+        # Outer glow
+        for glow_layer in range(3, 0, -1):
+            layer_alpha = max(0, min(255, alpha // (4 - glow_layer)))
+            layer_color = color + (layer_alpha // 2,)
+            pygame.draw.circle(sparkle_glow, layer_color, (6, 6), glow_layer)
+
+        # Bright center
+        pygame.draw.circle(sparkle_glow, (255, 255, 255, alpha), (6, 6), size)
+        return sparkle_glow
+
+    def _draw_snowflake(self, color, size):
+        """Single pixel or small dot"""
+        if size <= 1:
+            flake = pygame.Surface((1, 1))
+            flake.fill(color)
+            return flake
+        flake = pygame.Surface((size * 2 + 1, size * 2 + 1), pygame.SRCALPHA)
+        pygame.draw.circle(flake, color, (size, size), size)
+        return flake
+
+    def _render_streak(self, screen, x, y, velocity_x, velocity_y, length):
+        """Shooting star trail"""
+        dx = velocity_x / abs(velocity_x) if velocity_x != 0 else 0
+        dy = velocity_y / abs(velocity_y) if velocity_y != 0 else 0
+
+        # Normalize direction
+        mag = math.sqrt(dx * dx + dy * dy)
+        if mag > 0:
+            dx /= mag
+            dy /= mag
+
+        end_x = x + dx * length
+        end_y = y + dy * length
+
+        # Draw gradient trail
+        for i in range(3):
+            offset = i * 0.3
+            width = max(1, 3 - i)
+            pygame.draw.line(screen, (255, 255, 255),
+                             (int(x + dx * offset), int(y + dy * offset)),
+                             (int(end_x + dx * offset), int(end_y + dy * offset)),
+                             width)
@@ -0,0 +1,97 @@
+"""
+Struct-of-arrays entity storage
+A store keeps one NumPy array per component with live entities packed into
+slots [0, count). Entity objects are stable handles that read and write their
+slot through field properties; removing one moves the last entity into its
+slot, so stores are integrated with whole-array operations and never copied
+"""
+
+import itertools
+import numpy as np
+
+class EntityStore:
+    """Packed component arrays plus the entity object owning each slot"""
+
+    # Per-slot arrays (name -> dtype) - set by each store
+    FIELDS = {}
+
+    def __init__(self, capacity=64):
+        self.capacity = capacity
+        self.count = 0  # Live entities occupy slots [0, count)
+        for name, dtype in self.FIELDS.items():
+            setattr(self, name, np.zeros(capacity, dtype=dtype))
+        self.owners = [None] * capacity  # Slot -> entity
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        """Live entities in slot order (no copy - do not add or remove while iterating)"""
+        return itertools.islice(self.owners, self.count)
+
+    def add(self, entity):
+        """Give an entity the next slot (grows the arrays when full)"""
+        if self.count == self.capacity:
+            self._grow()
+        slot = self.count
+        for name in self.FIELDS:
+            getattr(self, name)[slot] = 0
+        self.owners[slot] = entity
+        self.count += 1
+        entity.store, entity.slot = self, slot
+        return slot
+
+    def _grow(self):
+        """Double the capacity"""
+        old = self.capacity
+        self.capacity *= 2
+        for name in self.FIELDS:
+            array = getattr(self, name)
+            grown = np.zeros(self.capacity, dtype=array.dtype)
+            grown[:old] = array
+            setattr(self, name, grown)
+        self.owners.extend([None] * old)
+
+    def remove(self, entity):
+        """Swap-remove an entity; its final state moves into a private one-slot store so the handle stays usable"""
+        if entity.store is not self:
+            return
+        slot = entity.slot
+        final = {name: getattr(self, name)[slot] for name in self.FIELDS}
+
+        # Last live entity fills the hole
+        last = self.count - 1
+        if slot != last:
+            for name in self.FIELDS:
+                array = getattr(self, name)
+                array[slot] = array[last]
+            moved = self.owners[last]
+            self.owners[slot] = moved
+            moved.slot = slot
+        self.owners[last] = None
+        self.count = last
+
+        # The entity's spare store from an earlier removal is reused
+        private = getattr(entity, 'spare_store', None)
+        if private is None:
+            private = type(self)(1)
+            entity.spare_store = private
+        private.count = 0
+        private.add(entity)
+        for name, value in final.items():
+            getattr(private, name)[0] = value
+
+    def get_owners(self, slots):
+        """Entities at the given slots"""
+        owners = self.owners
+        return [owners[slot] for slot in slots.tolist()]
+
+def slot_field(name):
+    """Attribute backed by one store array at the entity's slot"""
+    def get(self):
+        return getattr(self.store, name)[self.slot].item()
+
+    def set(self, value):
+        getattr(self.store, name)[self.slot] = value
+
+    return property(get, set)
@@ -1,67 +1,111 @@
 """
 Explosion animation for TNT
-Generates procedural pixel art explosion frames
+Generates procedural pixel art explosion frames, shared by every explosion
 """
 
 import pygame
 import random
 import math
-from constants import BLOCK_SIZE
+import numpy as np
+from constants import BLOCK_SIZE, EXPLOSION_SUBVARIANTS
+
+# Explosion variations: frame count and seconds per frame
+VARIATIONS = {
+    'A': (12, 0.04),   # Standard speed
+    'B': (14, 0.035),  # Faster
+    'C': (13, 0.042),  # Slightly slower
+}
+
+MAX_RADIUS = BLOCK_SIZE * 4.0  # HUGE explosion - 4 blocks radius!
+FRAME_SIZE = int(MAX_RADIUS * 2 + 40)
+
+# Frames shared by all explosions: (variation, sub-variant) -> surfaces (None until drawn)
+_frame_cache = {}
+
+def get_frames(variation, sub_variant):
+    """Get the shared frame list for one variation/sub-variant"""
+    key = (variation, sub_variant)
+    frames = _frame_cache.get(key)
+    if frames is None:
+        frames = [None] * VARIATIONS[variation][0]
+        _frame_cache[key] = frames
+    return frames
+
+def frame_jobs():
+    """(variation, sub-variant, frame) for every frame not drawn yet - for prewarming"""
+    jobs = []
+    for variation, (max_frames, _) in VARIATIONS.items():
+        for sub_variant in range(EXPLOSION_SUBVARIANTS):
+            frames = get_frames(variation, sub_variant)
+            jobs.extend((variation, sub_variant, i) for i in range(max_frames) if frames[i] is None)
+    return jobs
+
+def prepare_frame(variation, sub_variant, frame_num):
+    """Draw one shared frame if it is not cached yet"""
+    Explosion(0, 0, variation, sub_variant).prepare_frame(frame_num)
 
 class Explosion:
-    """Animated explosion effect"""
+    """Animated explosion effect (frame index and position into shared frames)"""
     
-    def __init__(self, x, y):
+    def __init__(self, x, y, variation=None, sub_variant=None):
+        self.reset(x, y, variation, sub_variant)
+    
+    def reset(self, x, y, variation=None, sub_variant=None):
+        """(Re)start the animation at a position - also used when reused from a pool"""
         self.x = x
         self.y = y
         self.frame = 0
         
-        # Randomly choose explosion variation (A, B, or C)
-        self.variation = random.choice(['A', 'B', 'C'])
+        # Randomly choose explosion variation (A, B, or C) and a seeded sub-variant
+        self.variation = variation or random.choice(list(VARIATIONS))
+        if sub_variant is None:
+            sub_variant = random.randrange(EXPLOSION_SUBVARIANTS)
+        self.sub_variant = sub_variant
         
         # Different timings for each variation
-        if self.variation == 'A':
-            self.max_frames = 12
-            self.frame_duration = 0.04  # Standard speed
-        elif self.variation == 'B':
-            self.max_frames = 14
-            self.frame_duration = 0.035  # Faster
-        else:  # C
-            self.max_frames = 13
-            self.frame_duration = 0.042  # Slightly slower
+        self.max_frames, self.frame_duration = VARIATIONS[self.variation]
         
         self.frame_timer = 0
         self.finished = False
         
-        # Generate all frames
-        self.frames = self._generate_frames()
+        self.frames = get_frames(self.variation, self.sub_variant)
     
-    def _generate_frames(self):
-        """Generate all explosion animation frames"""
-        frames = []
-        max_radius = BLOCK_SIZE * 4.0  # HUGE explosion - 4 blocks radius!
+    def prepare_frame(self, frame_num):
+        """Get a shared frame, drawing it on first use"""
+        surface = self.frames[frame_num]
+        if surface is None:
+            surface = self._generate_frame(frame_num)
+            
+            # Match the display format for fast blits (needs a display)
+            if pygame.display.get_surface() is not None:
+                surface = surface.convert_alpha()
+            self.frames[frame_num] = surface
+        return surface
+    
+    def _generate_frame(self, frame_num):
+        """Draw one explosion animation frame"""
+        max_radius = MAX_RADIUS
+        
+        # Seeded per frame so every frame of a sub-variant always looks the same
+        self.rng = random.Random(f"{self.variation}:{self.sub_variant}:{frame_num}")
         
-        for frame_num in range(self.max_frames):
-            # Calculate expansion progress (0.0 to 1.0)
-            progress = frame_num / (self.max_frames - 1)
-            
-            # Create surface for this frame
-            size = int(max_radius * 2 + 40)
-            surface = pygame.Surface((size, size), pygame.SRCALPHA)
-            center_x = size // 2
-            center_y = size // 2
-            
-            if frame_num == 0:  # WHITE FLASH FRAME
-                self._draw_white_flash(surface, center_x, center_y, max_radius)
-            elif frame_num < 8:  # Expanding phase
-                self._draw_explosion_expanding(surface, center_x, center_y, progress, max_radius)
-            else:  # Fading phase
-                fade_progress = (frame_num - 7) / 4
-                self._draw_explosion_fading(surface, center_x, center_y, fade_progress, max_radius)
-            
-            frames.append(surface)
+        # Calculate expansion progress (0.0 to 1.0)
+        progress = frame_num / (self.max_frames - 1)
         
-        return frames
+        # Create surface for this frame
+        surface = pygame.Surface((FRAME_SIZE, FRAME_SIZE), pygame.SRCALPHA)
+        center_x = FRAME_SIZE // 2
+        center_y = FRAME_SIZE // 2
+        
+        if frame_num == 0:  # WHITE FLASH FRAME
+            self._draw_white_flash(surface, center_x, center_y, max_radius)
+        elif frame_num < 8:  # Expanding phase
+            self._draw_explosion_expanding(surface, center_x, center_y, progress, max_radius)
+        else:  # Fading phase
+            fade_progress = (frame_num - 7) / 4
+            self._draw_explosion_fading(surface, center_x, center_y, fade_progress, max_radius)
+        
+        return surface
     
     def _draw_white_flash(self, surface, cx, cy, max_radius):
         """Draw initial white flash frame for maximum impact"""
@@ -141,13 +185,13 @@ class Explosion:
             
             # Wavy distortion
             wave_offset = math.sin(angle * 3 + progress * 5) * 10
-            dist = current_radius * random.uniform(0.75, 1.05) + wave_offset
+            dist = current_radius * self.rng.uniform(0.75, 1.05) + wave_offset
             
             x = cx + int(math.cos(angle) * dist)
             y = cy + int(math.sin(angle) * dist)
             
             color = self._get_flame_color()
-            pixel_size = random.randint(3, 7)
+            pixel_size = self.rng.randint(3, 7)
             pygame.draw.rect(surface, color, (x, y, pixel_size, pixel_size))
         
         # Middle layer
@@ -155,13 +199,13 @@ class Explosion:
         for i in range(40):
             angle = (i / 40) * 2 * math.pi - progress * 0.5
             spiral_offset = math.sin(angle * 2) * 8
-            dist = mid_radius * random.uniform(0.4, 1.0) + spiral_offset
+            dist = mid_radius * self.rng.uniform(0.4, 1.0) + spiral_offset
             
             x = cx + int(math.cos(angle) * dist)
             y = cy + int(math.sin(angle) * dist)
             
             color = self._get_hot_color()
-            pixel_size = random.randint(3, 6)
+            pixel_size = self.rng.randint(3, 6)
             pygame.draw.rect(surface, color, (x, y, pixel_size, pixel_size))
     
     def _draw_upward_burst(self, surface, cx, cy, current_radius, progress):
@@ -172,25 +216,25 @@ class Explosion:
             
             # Emphasize vertical direction
             vertical_bias = -0.7 if math.sin(angle) < 0 else 0.3
-            dist = current_radius * random.uniform(0.7, 1.0)
+            dist = current_radius * self.rng.uniform(0.7, 1.0)
             
             x = cx + int(math.cos(angle) * dist * 0.7)  # Narrower horizontally
             y = cy + int(math.sin(angle) * dist * 1.3 + vertical_bias * current_radius)  # Taller vertically
             
             color = self._get_flame_color()
-            pixel_size = random.randint(3, 8)
+            pixel_size = self.rng.randint(3, 8)
             pygame.draw.rect(surface, color, (x, y, pixel_size, pixel_size))
         
         # Upward plume in middle
         for i in range(35):
-            angle = random.uniform(-math.pi/3, math.pi/3) - math.pi/2  # Upward cone
-            dist = current_radius * random.uniform(0.4, 0.9)
+            angle = self.rng.uniform(-math.pi/3, math.pi/3) - math.pi/2  # Upward cone
+            dist = current_radius * self.rng.uniform(0.4, 0.9)
             
             x = cx + int(math.cos(angle) * dist * 0.5)
             y = cy + int(math.sin(angle) * dist * 1.2)
             
             color = self._get_hot_color()
-            pixel_size = random.randint(4, 7)
+            pixel_size = self.rng.randint(4, 7)
             pygame.draw.rect(surface, color, (x, y, pixel_size, pixel_size))
     
     def _draw_cross_pattern(self, surface, cx, cy, current_radius, progress):
@@ -202,32 +246,32 @@ class Explosion:
             
             # Emphasize diagonal directions (45, 135, 225, 315 degrees)
             diagonal_emphasis = abs(math.cos(angle * 2))  # High at 45° angles
-            dist = current_radius * random.uniform(0.7, 1.0) * (0.8 + diagonal_emphasis * 0.4)
+            dist = current_radius * self.rng.uniform(0.7, 1.0) * (0.8 + diagonal_emphasis * 0.4)
             
             x = cx + int(math.cos(angle) * dist)
             y = cy + int(math.sin(angle) * dist)
             
             color = self._get_flame_color()
-            pixel_size = random.randint(3, 7) if diagonal_emphasis > 0.5 else random.randint(2, 5)
+            pixel_size = self.rng.randint(3, 7) if diagonal_emphasis > 0.5 else self.rng.randint(2, 5)
             pygame.draw.rect(surface, color, (x, y, pixel_size, pixel_size))
         
         # Cross arms with extra particles
         for arm in range(4):
             base_angle = arm * math.pi / 2 + math.pi / 4  # 45, 135, 225, 315
             for j in range(15):
-                dist = current_radius * random.uniform(0.5, 1.1)
-                angle_offset = random.uniform(-0.2, 0.2)
+                dist = current_radius * self.rng.uniform(0.5, 1.1)
+                angle_offset = self.rng.uniform(-0.2, 0.2)
                 
                 x = cx + int(math.cos(base_angle + angle_offset) * dist)
                 y = cy + int(math.sin(base_angle + angle_offset) * dist)
                 
                 color = self._get_hot_color()
-                pixel_size = random.randint(4, 7)
+                pixel_size = self.rng.randint(4, 7)
                 pygame.draw.rect(surface, color, (x, y, pixel_size, pixel_size))
     
     def _get_flame_color(self):
         """Get random flame color"""
-        color_mix = random.random()
+        color_mix = self.rng.random()
         if color_mix < 0.25:
             return (255, 0, 0, 255)  # Pure red
         elif color_mix < 0.5:
@@ -239,9 +283,9 @@ class Explosion:
     
     def _get_hot_color(self):
         """Get random hot center color"""
-        if random.random() < 0.4:
+        if self.rng.random() < 0.4:
             return (255, 220, 0, 250)  # Bright orange
-        elif random.random() < 0.7:
+        elif self.rng.random() < 0.7:
             return (255, 255, 150, 240)  # Yellow
         else:
             return (255, 255, 255, 230)  # White hot
@@ -251,17 +295,17 @@ class Explosion:
         core_radius = current_radius * (0.45 - progress * 0.15)
         
         for i in range(35):
-            angle = random.random() * 2 * math.pi
-            dist = core_radius * random.random()
+            angle = self.rng.random() * 2 * math.pi
+            dist = core_radius * self.rng.random()
             x = cx + int(math.cos(angle) * dist)
             y = cy + int(math.sin(angle) * dist)
             
-            if random.random() < 0.7:
+            if self.rng.random() < 0.7:
                 color = (255, 255, 255, 255)  # Pure white
             else:
                 color = (255, 255, 220, 255)  # Slight yellow tint
             
-            pixel_size = random.randint(3, 6)
+            pixel_size = self.rng.randint(3, 6)
             pygame.draw.rect(surface, color, (x, y, pixel_size, pixel_size))
     
     def _draw_debris(self, surface, cx, cy, current_radius, progress):
@@ -271,34 +315,34 @@ class Explosion:
         for i in range(debris_count):
             if self.variation == 'A':
                 # Circular - debris goes in all directions evenly
-                angle = (i / debris_count) * 2 * math.pi + random.uniform(-0.5, 0.5)
+                angle = (i / debris_count) * 2 * math.pi + self.rng.uniform(-0.5, 0.5)
             elif self.variation == 'B':
                 # Upward - most debris goes up and to sides
                 if i < debris_count * 0.7:
-                    angle = random.uniform(-math.pi*0.75, -math.pi*0.25)  # Upward
+                    angle = self.rng.uniform(-math.pi*0.75, -math.pi*0.25)  # Upward
                 else:
-                    angle = random.uniform(0, 2 * math.pi)  # Some go everywhere
+                    angle = self.rng.uniform(0, 2 * math.pi)  # Some go everywhere
             else:  # C
                 # Cross - debris follows diagonal paths
                 quadrant = i % 4
                 base = quadrant * math.pi / 2 + math.pi / 4
-                angle = base + random.uniform(-0.4, 0.4)
+                angle = base + self.rng.uniform(-0.4, 0.4)
             
             dist = current_radius * (1.3 + progress * 0.8)
             x = cx + int(math.cos(angle) * dist)
             y = cy + int(math.sin(angle) * dist)
             
             # Varied debris types
-            debris_type = random.random()
+            debris_type = self.rng.random()
             if debris_type < 0.4:
                 color = (120, 120, 120, 240)  # Gray block
-                size = random.randint(4, 8)  # CHUNKY
+                size = self.rng.randint(4, 8)  # CHUNKY
             elif debris_type < 0.7:
                 color = (255, 180, 0, 250)  # Orange ember
-                size = random.randint(3, 6)
+                size = self.rng.randint(3, 6)
             else:
                 color = (255, 100, 0, 255)  # Red hot fragment
-                size = random.randint(2, 5)
+                size = self.rng.randint(2, 5)
             
             pygame.draw.rect(surface, color, (x, y, size, size))
             
@@ -316,24 +360,24 @@ class Explosion:
         
         # MASSIVE smoke clouds (dark gray/brown)
         for i in range(50):  # More smoke!
-            angle = (i / 50) * 2 * math.pi + random.uniform(-0.3, 0.3)
-            dist = smoke_radius * random.uniform(0.5, 1.1)
+            angle = (i / 50) * 2 * math.pi + self.rng.uniform(-0.3, 0.3)
+            dist = smoke_radius * self.rng.uniform(0.5, 1.1)
             
             # Smoke rises and expands
             x = cx + int(math.cos(angle) * dist)
             y = cy + int(math.sin(angle) * dist - fade_progress * 20)
             
-            smoke_alpha = int(180 * alpha_mult * random.uniform(0.4, 1.0))
+            smoke_alpha = int(180 * alpha_mult * self.rng.uniform(0.4, 1.0))
             
             # Varied smoke colors (more dramatic)
-            if random.random() < 0.3:
-                gray_value = random.randint(20, 40)  # Dark smoke
-            elif random.random() < 0.6:
-                gray_value = random.randint(40, 70)  # Medium smoke
+            if self.rng.random() < 0.3:
+                gray_value = self.rng.randint(20, 40)  # Dark smoke
+            elif self.rng.random() < 0.6:
+                gray_value = self.rng.randint(40, 70)  # Medium smoke
             else:
-                gray_value = random.randint(70, 100)  # Light smoke
+                gray_value = self.rng.randint(70, 100)  # Light smoke
             
-            pixel_size = random.randint(5, 10)  # CHUNKY smoke
+            pixel_size = self.rng.randint(5, 10)  # CHUNKY smoke
             
             # Create small surface with alpha for smoke particle
             smoke_surf = pygame.Surface((pixel_size, pixel_size))
@@ -343,17 +387,17 @@ class Explosion:
         
         # Lots of fading embers
         for i in range(30):
-            angle = random.random() * 2 * math.pi
-            dist = smoke_radius * random.uniform(0.3, 0.9)
+            angle = self.rng.random() * 2 * math.pi
+            dist = smoke_radius * self.rng.uniform(0.3, 0.9)
             
             # Embers drift outward and down
             x = cx + int(math.cos(angle) * dist * (1 + fade_progress * 0.3))
             y = cy + int(math.sin(angle) * dist + fade_progress * 15)
             
-            ember_alpha = int(240 * alpha_mult * random.uniform(0.2, 1.0))
+            ember_alpha = int(240 * alpha_mult * self.rng.uniform(0.2, 1.0))
             
             # Hot ember colors
-            ember_type = random.random()
+            ember_type = self.rng.random()
             if ember_type < 0.3:
                 ember_color = (255, 50, 0)  # Red hot
             elif ember_type < 0.6:
@@ -361,7 +405,7 @@ class Explosion:
             else:
                 ember_color = (255, 200, 0)  # Yellow
             
-            pixel_size = random.randint(2, 5)
+            pixel_size = self.rng.randint(2, 5)
             
             # Create ember particle with alpha
             ember_surf = pygame.Surface((pixel_size, pixel_size))
@@ -382,15 +426,15 @@ class Explosion:
         if fade_progress < 0.5:
             flicker_count = int(20 * (1 - fade_progress * 2))
             for i in range(flicker_count):
-                angle = random.random() * 2 * math.pi
-                dist = smoke_radius * random.uniform(0.2, 0.6)
+                angle = self.rng.random() * 2 * math.pi
+                dist = smoke_radius * self.rng.uniform(0.2, 0.6)
                 x = cx + int(math.cos(angle) * dist)
                 y = cy + int(math.sin(angle) * dist)
                 
-                flicker_alpha = int(200 * alpha_mult * random.random())
-                flicker_color = (255, random.randint(150, 255), 0)
+                flicker_alpha = int(200 * alpha_mult * self.rng.random())
+                flicker_color = (255, self.rng.randint(150, 255), 0)
                 
-                pixel_size = random.randint(3, 6)
+                pixel_size = self.rng.randint(3, 6)
                 
                 # Create flicker particle with alpha
                 flicker_surf = pygame.Surface((pixel_size, pixel_size))
@@ -400,20 +444,15 @@ class Explosion:
     
     def _draw_circle_outline(self, surface, cx, cy, radius, thickness, color):
         """Draw pixelated circle outline"""
-        points = []
         steps = int(radius * 2)
-        for i in range(steps):
-            angle = (i / steps) * 2 * math.pi
-            x = cx + int(math.cos(angle) * radius)
-            y = cy + int(math.sin(angle) * radius)
-            points.append((x, y))
+        if steps < 2:
+            return
         
-        # Draw thick line
-        if len(points) > 1:
-            for i in range(len(points)):
-                p1 = points[i]
-                p2 = points[(i + 1) % len(points)]
-                pygame.draw.line(surface, color, p1, p2, thickness)
+        # Points around the circle in one array op, outline in one closed polyline call
+        angles = np.arange(steps) * (2 * math.pi / steps)
+        xs = cx + (np.cos(angles) * radius).astype(int)
+        ys = cy + (np.sin(angles) * radius).astype(int)
+        pygame.draw.lines(surface, color, True, np.column_stack((xs, ys)).tolist(), thickness)
     
     def update(self, dt):
         """Update animation frame"""
@@ -435,11 +474,9 @@ class Explosion:
     
     def get_current_frame(self):
         """Get current animation frame surface"""
-        return self.frames[self.frame]
+        return self.prepare_frame(self.frame)
     
     def get_position(self):
         """Get explosion center position for rendering"""
-        frame_surface = self.frames[0]
-        offset_x = frame_surface.get_width() // 2
-        offset_y = frame_surface.get_height() // 2
-        return (self.x - offset_x, self.y - offset_y)
+        offset = FRAME_SIZE // 2
+        return (self.x - offset, self.y - offset)
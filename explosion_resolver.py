@@ -0,0 +1,300 @@
+"""
+Explosion resolver - handles every TNT detonation of a frame as one batch
+Chain reactions are solved up front with the world's TNT spatial hash, craters are carved
+once as a union and sound, shake and particles become one aggregate event.
+Block removal and knockback happen immediately; particles, animations and
+drops go to the world's frame-budgeted effect queue
+"""
+
+import random
+import numpy as np
+from debris import DebrisAggregator
+from sound_generator import sound_gen, SOUND_ENABLED
+from constants import *
+
+class ExplosionResolver:
+    """Resolves all TNT detonating in the same frame together"""
+
+    def __init__(self, world):
+        self.world = world
+        self.debris = DebrisAggregator()
+
+    def resolve(self, detonating, player=None, game=None):
+        """Detonate TNT (and everything their chain reaction reaches)"""
+        world = self.world
+        detonating = list(detonating)
+
+        self._chain_closure(detonating)
+        for tnt in detonating:
+            tnt.exploded = True
+            world.wake_tnt(tnt)
+            world.tnt_hash.remove(tnt)
+            world.tnt_store.remove(tnt)
+        self._push_survivors(detonating)
+
+        print(f"[TNT] BOOM x{len(detonating)}!")
+
+        self._play_effects(detonating, player, game)
+
+        # Player gets knocked back by each blast (resistance limits stacking)
+        if player:
+            for tnt in detonating:
+                self._knock_back_player(tnt, player)
+
+        self._carve_craters(detonating, player, game)
+
+        # Cosmetic work is spread over the next frames
+        world.effect_queue.push(self._spawn_fire_particles, detonating)
+        for tnt in detonating:
+            world.effect_queue.push(self._roll_rare_drop, tnt)
+
+        # Back to the pool once the queued jobs above have read them (the queue is FIFO)
+        world.effect_queue.push(self._release_tnt, detonating)
+
+    def _release_tnt(self, detonating):
+        """Return exploded TNT to the world's pool"""
+        for tnt in detonating:
+            self.world.tnt_pool.release(tnt)
+
+    def _chain_closure(self, detonating):
+        """Append every TNT caught in the chain reaction to detonating"""
+        exploded = {id(tnt) for tnt in detonating}
+        tnt_hash = self.world.tnt_hash
+        reach = (TNT_CHAIN_RADIUS + 1) * BLOCK_SIZE  # Covers every TNT within the radius in grid cells
+
+        # detonating grows while we walk it - each new TNT can trigger more
+        i = 0
+        while i < len(detonating):
+            tnt = detonating[i]
+            i += 1
+            center_x = int(tnt.x // BLOCK_SIZE)
+            center_y = int(tnt.y // BLOCK_SIZE)
+            for other in tnt_hash.query_rect(tnt.x - reach, tnt.y - reach, reach * 2, reach * 2):
+                if id(other) in exploded:
+                    continue
+                dx = int(other.x // BLOCK_SIZE) - center_x
+                dy = int(other.y // BLOCK_SIZE) - center_y
+                if dx * dx + dy * dy <= TNT_CHAIN_RADIUS * TNT_CHAIN_RADIUS:
+                    other.fuse_time = 0
+                    exploded.add(id(other))
+                    detonating.append(other)
+
+        return exploded
+
+    def _push_survivors(self, detonating):
+        """Knock surviving TNT away from the closest blast and shorten its fuse"""
+        push_radius = TNT_PUSH_RADIUS * BLOCK_SIZE
+
+        # Closest blast per surviving TNT (exploded TNT already left the hash): id -> (distance, dx, dy, tnt)
+        closest = {}
+        for tnt in detonating:
+            for other in self.world.tnt_hash.query_radius(tnt.x, tnt.y, push_radius):
+                dx = other.x - tnt.x
+                dy = other.y - tnt.y
+                distance = (dx * dx + dy * dy) ** 0.5
+                if 0 < distance < push_radius:
+                    best = closest.get(id(other))
+                    if best is None or distance < best[0]:
+                        closest[id(other)] = (distance, dx, dy, other)
+
+        for distance, dx, dy, other in closest.values():
+            # Force decreases with distance
+            distance_ratio = 1.0 - (distance / push_radius)
+            force_multiplier = distance_ratio ** 0.5
+
+            # TNT gets stronger knockback than player
+            base_force = TNT_KNOCKBACK_FORCE * 2.5
+            knockback_x = dx / distance * base_force * force_multiplier
+            knockback_y = dy / distance * base_force * force_multiplier
+
+            # Add upward component to make TNT fly
+            if knockback_y > 0:  # If pushing down
+                knockback_y *= 0.3
+            else:  # If pushing up
+                knockback_y *= 1.2
+
+            # Ensure minimum upward component
+            knockback_y = min(knockback_y, -base_force * 0.4)
+
+            self.world.wake_tnt(other)
+            other.velocity_x = knockback_x
+            other.velocity_y = knockback_y
+            other.is_falling = True
+            other.on_ground = False
+
+            # Reduce fuse time slightly to create cascading effect
+            other.fuse_time = min(other.fuse_time, random.uniform(1.0, 2.5))
+
+            print(f"[TNT] Chain reaction! Pushed TNT at distance {distance:.1f}, Force: ({knockback_x:.1f}, {knockback_y:.1f}), New fuse: {other.fuse_time:.1f}s")
+
+    def _play_effects(self, detonating, player, game):
+        """One sound, flash and screen shake for the whole batch"""
+        world = self.world
+
+        # Closest blast decides volume and shake strength
+        distance_to_player = None
+        if player:
+            distance_to_player = min(((tnt.x - player.x) ** 2 + (tnt.y - player.y) ** 2) ** 0.5
+                                     for tnt in detonating)
+
+        if SOUND_ENABLED:
+            volume = 1.0
+            if distance_to_player is not None:
+                max_distance = 500  # Maximum hearing distance
+                volume = max(0.1, 1.0 - (distance_to_player / max_distance))
+            sound_gen.play_explosion(volume)
+
+        # Explosion animations, spread evenly over the batch
+        step = -(-len(detonating) // EXPLOSION_BATCH_ANIMATIONS)
+        for tnt in detonating[::step]:
+            explosion_x = int(tnt.x // BLOCK_SIZE) * BLOCK_SIZE + BLOCK_SIZE // 2
+            explosion_y = int(tnt.y // BLOCK_SIZE) * BLOCK_SIZE + BLOCK_SIZE // 2
+            world.effect_queue.push(self._start_animation, explosion_x, explosion_y)
+
+        if game:
+            if distance_to_player is not None:
+                max_shake_distance = (TNT_EXPLOSION_RADIUS + 5) * BLOCK_SIZE
+                if distance_to_player < max_shake_distance:
+                    shake_intensity = 15 * (1.0 - distance_to_player / max_shake_distance)
+                    game.trigger_screen_shake(shake_intensity, 0.3)
+            else:
+                game.trigger_screen_shake(10, 0.3)
+
+            game.trigger_flash((255, 200, 100), 180)
+
+            max_power = max(tnt.power_level for tnt in detonating)
+            game.explosion_flash = 0.5
+            game.screen_shake = 10 * (1 + max_power * 0.3)
+
+    def _knock_back_player(self, tnt, player):
+        """Launch the player away from a blast"""
+        dx = player.x + player.width / 2 - (tnt.x + tnt.width / 2)
+        dy = player.y + player.height / 2 - (tnt.y + tnt.height / 2)
+        distance = (dx * dx + dy * dy) ** 0.5
+
+        max_knockback_distance = (TNT_EXPLOSION_RADIUS + 2) * BLOCK_SIZE
+        if distance >= max_knockback_distance:
+            return
+
+        if distance > 0:
+            # Force decreases with distance (clamped falloff)
+            distance_ratio = 1.0 - (distance / max_knockback_distance)
+            force_multiplier = distance_ratio ** 0.7  # Power < 1 for smoother falloff
+
+            base_force = TNT_KNOCKBACK_FORCE
+            knockback_x = dx / distance * base_force * force_multiplier
+            knockback_y = dy / distance * base_force * force_multiplier
+
+            # Add extra upward force for dramatic effect
+            if knockback_y > 0:  # If pushing down, reduce it
+                knockback_y *= 0.5
+            else:  # If pushing up, enhance it
+                knockback_y *= 1.5
+
+            # Ensure minimum upward component
+            knockback_y = min(knockback_y, -base_force * 0.3)
+
+            # Variable hurt duration based on distance
+            hurt_duration = 0.5 + (0.5 * distance_ratio)  # 0.5-1.0 seconds
+
+            # Calculate damage based on TNT power level (1 base damage + 1 per 2 levels)
+            tnt_damage = 1 + (tnt.power_level // 2)
+
+            player.apply_knockback(knockback_x, knockback_y, hurt_duration, damage=tnt_damage)
+            print(f"[TNT] Player launched! Distance: {distance:.1f}, Force: ({knockback_x:.1f}, {knockback_y:.1f}), Hurt: {hurt_duration:.1f}s, Damage: {tnt_damage}")
+        else:
+            # Direct hit - maximum force and damage
+            tnt_damage = 2 + (tnt.power_level // 2)
+            player.apply_knockback(0, -TNT_KNOCKBACK_FORCE * 1.5, 1.0, damage=tnt_damage)
+            print(f"[TNT] DIRECT HIT! Maximum knockback! Damage: {tnt_damage}")
+
+    def _carve_craters(self, detonating, player, game):
+        """Carve the union of all craters in one grid operation"""
+        world = self.world
+
+        # Calculate boosted radius from player's TNT power level
+        explosion_radius = TNT_EXPLOSION_RADIUS
+        if player:
+            explosion_radius += int(player.tnt_power_level * 0.5)  # +0.5 blocks per level
+
+        centers = {(int(tnt.x // BLOCK_SIZE), int(tnt.y // BLOCK_SIZE)) for tnt in detonating}
+        crater = world.crater_engine.carve_many(world, list(centers), explosion_radius)
+
+        # Debris grouped by block type and region, emitted on a later frame
+        groups = self.debris.aggregate(crater['xs'], crater['ys'], crater['ids'])
+        world.effect_queue.push(self._spawn_debris, groups)
+
+        world.effect_queue.push(world._drop_crater_ores, crater, EXPLOSION_MAX_ORE_DROPS * len(detonating))
+
+        if game and hasattr(game, 'stats'):
+            game.stats.on_blocks_blasted(crater['counts'])
+
+        print(f"Explosion destroyed {len(crater['xs'])} blocks (radius {explosion_radius}, {len(centers)} craters)")
+
+    def _start_animation(self, x, y):
+        """Add an explosion animation"""
+        self.world.explosions.append(self.world.explosion_pool.acquire(x, y))
+
+    def _spawn_debris(self, groups):
+        """Debris particles for a crater, sized to the particle budget"""
+        budget = self.debris.get_budget(groups, self.world.particles)
+        self.debris.emit(groups, budget, self.world.particles)
+
+    def _spawn_fire_particles(self, detonating):
+        """Shared fire particle budget, split round-robin over the blasts"""
+        wanted = sum(30 + tnt.power_level * 10 for tnt in detonating)
+        count = min(wanted, EXPLOSION_BATCH_PARTICLES)
+        if not count:
+            return
+
+        xs, ys, colors, spreads, lifetimes = [], [], [], [], []
+        for i in range(count):
+            tnt = detonating[i % len(detonating)]
+
+            # Colored particles based on TNT power level
+            if tnt.power_level >= 5:
+                particle_colors = [(255, 100, 255), (200, 0, 255), (255, 0, 200)]  # Pink/Purple
+            elif tnt.power_level >= 2:
+                particle_colors = [(150, 0, 255), (200, 50, 255), (100, 0, 200)]  # Purple
+            else:
+                particle_colors = [(255, 100, 0), (255, 150, 0), (255, 200, 0)]  # Orange/Yellow
+
+            xs.append(tnt.x)
+            ys.append(tnt.y)
+            colors.append(particle_colors[i % len(particle_colors)])
+            spreads.append(1 + tnt.power_level * 0.2)
+            lifetimes.append(1.0 + (tnt.power_level * 0.2))
+
+        # Emitted as one batch
+        rng = self.world.particles.rng
+        spreads = np.array(spreads)
+        self.world.particles.emit(count, xs, ys, colors,
+                                  velocity_x=rng.uniform(-200, 200, count) * spreads,
+                                  velocity_y=rng.uniform(-200, 200, count) * spreads,
+                                  lifetime=lifetimes)
+
+    def _roll_rare_drop(self, tnt):
+        """Chance of a rare item or heart from a blast"""
+        world = self.world
+        drop_chance = random.random()
+        if drop_chance < 0.10:  # 10% chance to drop rare item
+            rare_items = ['magnet', 'double_jump', 'speed_boost', 'shield', 'block_breaker']
+            item_type = random.choice(rare_items)
+
+            # Spawn item at explosion location with upward velocity
+            item_x = tnt.x + random.uniform(-BLOCK_SIZE, BLOCK_SIZE)
+            item_y = tnt.y - BLOCK_SIZE * 2  # Spawn above explosion
+
+            world.spawn_item(item_x, item_y, item_type)
+            print(f"[RARE DROP] {item_type}!")
+
+            # Extra particles for item drop
+            world.particles.emit(20, item_x, item_y, (255, 255, 0), lifetime=0.8,
+                                 priority=PARTICLE_GAMEPLAY)  # Gold sparkles
+
+        # 5% chance to drop heart item
+        elif drop_chance < 0.15:
+            item_x = tnt.x + random.uniform(-BLOCK_SIZE, BLOCK_SIZE)
+            item_y = tnt.y - BLOCK_SIZE * 2
+            world.spawn_item(item_x, item_y, 'heart')
+            print(f"[HEART DROP] Heart item!")
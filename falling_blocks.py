@@ -0,0 +1,74 @@
+"""
+Falling block physics for loose blocks (sand, red sand, soul sand)
+Driven by world block-change events - only disturbed columns are checked
+"""
+
+import numpy as np
+from constants import LOOSE_BLOCKS, FALLING_BLOCK_STEP, FALLING_BLOCK_BATCH, BLOCK_TYPES
+
+# Lookup table indexed by block id: does this block fall when unsupported?
+LOOSE_LUT = np.array([block_type in LOOSE_BLOCKS for block_type in BLOCK_TYPES])
+
+class FallingBlockSystem:
+    """Drops loose blocks that lost the block supporting them"""
+
+    def __init__(self, world):
+        self.world = world
+        self.dirty = set()  # Cells that may hold an unsupported loose block
+        self.step_timer = 0
+
+        world.add_block_listener(self.on_blocks_changed)
+
+    def on_blocks_changed(self, xs, ys):
+        """Queue loose blocks sitting on top of removed blocks for a re-check"""
+        grid = self.world.block_grid
+        above = ys > 0
+        xs, ys = xs[above], ys[above]
+        removed = grid[xs, ys] == 0
+        xs, ys = xs[removed], ys[removed] - 1
+        loose = LOOSE_LUT[grid[xs, ys]]
+        self.dirty.update(zip(xs[loose].tolist(), ys[loose].tolist()))
+
+    def update(self, dt):
+        """Move every unsupported loose column down by one block per step"""
+        if not self.dirty:
+            self.step_timer = 0
+            return
+
+        self.step_timer += dt
+        if self.step_timer < FALLING_BLOCK_STEP:
+            return
+        self.step_timer = 0
+
+        # Resolve lowest cells first so stacked columns collapse bottom-up
+        batch = sorted(self.dirty, key=lambda cell: -cell[1])[:FALLING_BLOCK_BATCH]
+        self.dirty.difference_update(batch)
+
+        for x, y in batch:
+            self._drop_column(x, y)
+
+    def _drop_column(self, x, y):
+        """Shift the loose run ending at (x, y) down one block if unsupported"""
+        world = self.world
+        block = world.get_block(x, y)
+        if not block or block.type not in LOOSE_BLOCKS:
+            return
+        if y + 1 >= world.height or world.get_block(x, y + 1) is not None:
+            return
+
+        # Find the top of the contiguous loose run above this cell
+        top = y
+        while top > 0:
+            above = world.get_block(x, top - 1)
+            if not above or above.type not in LOOSE_BLOCKS:
+                break
+            top -= 1
+
+        # Move the run down one cell, bottom block first
+        for by in range(y, top - 1, -1):
+            block_type = world.get_block(x, by).type
+            world.set_block(x, by + 1, block_type)
+        world.set_block(x, top, 'air')
+
+        # Keep falling next step until something solid is below
+        self.dirty.add((x, y + 1))
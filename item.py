@@ -1,35 +1,153 @@
 """
 Collectible items (pickaxes, resources, etc.)
+Item state lives in an ItemStore so timers and expiry advance for every item
+in one vectorized step; only falling items are moved one by one and resting
+items sleep until their support changes. Floating, spinning and pulsing are
+derived from the item's age when it is drawn
 """
 
 import pygame
 import math
-from constants import BLOCK_SIZE
+import numpy as np
+from entity_store import EntityStore, slot_field
+from collision import EPSILON
+from emitters import Emitter, STYLE_SPARKLE
+from constants import BLOCK_SIZE, ITEM_STACK_MAX
+
+# Item textures shared by every item of a type: item_type -> Surface
+_texture_cache = {}
+
+class ItemStore(EntityStore):
+    """Struct-of-arrays item state, one slot per live item"""
+    
+    # Per-slot arrays (name -> dtype); Item exposes each one as an attribute
+    FIELDS = {
+        'x': np.float64,
+        'y': np.float64,
+        'width': np.int32,
+        'height': np.int32,
+        'velocity_y': np.float64,
+        'on_ground': bool,
+        'sleeping': bool,  # Resting on its support cells - no physics until woken
+        'is_rare': bool,
+        'rotation_speed': np.float64,
+        'born': np.float64,  # Store clock at spawn - animation is derived from the age
+        'lifetime': np.float64,
+        'lifetime_warning': bool,
+        'collection_delay': np.float64,
+        'stack': np.int32,  # Items merged into this one
+        'lod_dt': np.float64,  # Time waited for a reduced-rate update (see update_lod)
+    }
+    
+    def __init__(self, capacity=64):
+        super().__init__(capacity)
+        self.now = 0.0  # Store clock (seconds)
+    
+    def advance(self, dt):
+        """Move the store clock on - once per frame, however many update batches run"""
+        self.now += dt
+    
+    def update(self, dt, world, slots=None):
+        """
+        Advance every item (or just the given slots) in one step - sleeping items only age
+        Returns (expired, moved, landed) - items whose lifetime ran out, live items
+        that fell and live items that came to rest on the ground
+        """
+        if slots is None:
+            slots = np.arange(self.count)
+        if not len(slots):
+            return [], [], []
+        
+        # Update collection delay
+        delay = self.collection_delay[slots]
+        self.collection_delay[slots] = np.where(delay > 0, delay - dt, delay)
+        
+        # Update lifetime
+        lifetime = self.lifetime[slots] - dt
+        self.lifetime[slots] = lifetime
+        expired = slots[lifetime <= 0]
+        warned = slots[(lifetime <= 2.0) & ~self.lifetime_warning[slots]]
+        self.lifetime_warning[warned] = True
+        for item in self.get_owners(warned):
+            print(f"[ITEM] {item.item_type} will disappear in {item.lifetime:.1f}s!")
+        
+        # Sparkle effects for rare items on screen (emitted into the world's effect pool)
+        rare = slots[self.is_rare[slots]]
+        if len(rare):
+            rare = rare[world.particles.budget.get_visible_mask(self.x[rare], self.y[rare])]
+            for item in self.get_owners(rare):
+                item.sparkle_emitter.update(dt, world.effects)
+        
+        # Sleeping items stay put until a support cell changes
+        slots = slots[~self.sleeping[slots]]
+        
+        # Resting items fall again if the ground was blown away, otherwise sleep on it
+        grounded = slots[self.on_ground[slots]]
+        if len(grounded):
+            below = self.y[grounded] + self.height[grounded]
+            left, left_xs, grid_ys = world.solid_grid.solid_at(self.x[grounded], below)
+            right, right_xs, _ = world.solid_grid.solid_at(self.x[grounded] + self.width[grounded] - EPSILON, below)
+            supported = left | right
+            self.on_ground[grounded[~supported]] = False
+            for item, on_left, on_right, left_x, right_x, grid_y in zip(
+                    self.get_owners(grounded[supported]), left[supported].tolist(), right[supported].tolist(),
+                    left_xs[supported].tolist(), right_xs[supported].tolist(), grid_ys[supported].tolist()):
+                supports = [(left_x, grid_y)] if on_left else []
+                if on_right and right_x != left_x:
+                    supports.append((right_x, grid_y))
+                world.sleep_item(item, supports)
+        
+        # Gravity if not on ground
+        falling = slots[~self.on_ground[slots]]
+        velocity_y = np.minimum(self.velocity_y[falling] + 800 * dt, 400)  # Gravity
+        sweep = world.solid_grid.sweep
+        for slot, x, y, width, height, speed in zip(
+                falling.tolist(), self.x[falling].tolist(), self.y[falling].tolist(),
+                self.width[falling].tolist(), self.height[falling].tolist(), velocity_y.tolist()):
+            # Fall swept through the grid (lands on the first solid cell, even at large dt)
+            _, self.y[slot], _, hit_y = sweep(x, y, width, height, 0, speed * dt)
+            if hit_y < 0:
+                speed = 0  # Bounced into a ceiling
+            if hit_y > 0:
+                speed = 0
+                self.on_ground[slot] = True
+                
+                # Bounce effect on landing
+                if self.now - self.born[slot] < 1.0:  # Only bounce when first landing
+                    speed = -150
+                    self.on_ground[slot] = False
+            self.velocity_y[slot] = speed
+        
+        moved = falling[self.lifetime[falling] > 0]
+        landed = moved[self.on_ground[moved]]
+        return self.get_owners(expired), self.get_owners(moved), self.get_owners(landed)
 
 class Item:
-    """Collectible item in world"""
+    """Collectible item in world (a view onto its ItemStore slot)"""
     
-    def __init__(self, x, y, item_type):
+    def __init__(self, x, y, item_type, store=None):
+        # Sparkles every 0.08s (rare items only)
+        self.sparkle_emitter = Emitter(self._emit_sparkles, 0.08)
+        self.reset(x, y, item_type, store)
+    
+    def reset(self, x, y, item_type, store=None):
+        """(Re)initialize as a freshly dropped item - also used when reused from a pool"""
+        (store if store is not None else ItemStore(1)).add(self)  # Sets self.store and self.slot
         self.x = x
         self.y = y
         self.item_type = item_type  # 'wood_pickaxe', 'stone_pickaxe', etc.
+        self.stack = 1  # How many items this entity stands for
         self.width = BLOCK_SIZE
         self.height = BLOCK_SIZE
         
         # Physics
         self.velocity_y = 0
         self.on_ground = False
+        self.supports = None  # Grid cells holding a sleeping item up
         
-        # Enhanced Animation
-        self.float_timer = 0
-        self.float_offset = 0
-        self.rotation = 0
+        # Enhanced Animation (computed from the age at render time)
+        self.born = self.store.now
         self.rotation_speed = 45  # degrees per second
-        self.glow_pulse = 0
-        self.sparkle_timer = 0
-        self.sparkles = []
-        self.spawn_timer = 0
-        self.scale_pulse = 1.0
         
         # Rare items have special effects
         self.is_rare = item_type in ['magnet', 'double_jump', 'speed_boost', 'shield', 'block_breaker', 'crystal', 'rare_ore', 'heart', 'coal_ore', 'iron_ore', 'gold_ore', 'diamond_ore']
@@ -41,8 +159,29 @@ class Item:
         # Collection delay - items can't be collected for 1.5 seconds after spawn
         self.collection_delay = 1.5
         
-        # Generate texture
-        self.texture = self._generate_texture()
+        self.sparkle_emitter.reset()
+        
+        # Texture depends only on the type - drawn once per type
+        self.texture = _texture_cache.get(item_type)
+        if self.texture is None:
+            self.texture = self._generate_texture()
+            _texture_cache[item_type] = self.texture
+    
+    # State held in the store
+    x = slot_field('x')
+    y = slot_field('y')
+    width = slot_field('width')
+    height = slot_field('height')
+    velocity_y = slot_field('velocity_y')
+    on_ground = slot_field('on_ground')
+    sleeping = slot_field('sleeping')
+    is_rare = slot_field('is_rare')
+    rotation_speed = slot_field('rotation_speed')
+    born = slot_field('born')
+    lifetime = slot_field('lifetime')
+    lifetime_warning = slot_field('lifetime_warning')
+    collection_delay = slot_field('collection_delay')
+    stack = slot_field('stack')
     
     def _generate_texture(self):
         """Generate pickaxe sprite based on type"""
@@ -381,76 +520,20 @@ class Item:
         return inside
     
     def update(self, dt, world):
-        """Update item physics and animation"""
-        self.spawn_timer += dt
-        
-        # Update collection delay
-        if self.collection_delay > 0:
-            self.collection_delay -= dt
-        
-        # Update lifetime
-        self.lifetime -= dt
-        if self.lifetime <= 2.0 and not self.lifetime_warning:
-            self.lifetime_warning = True
-            print(f"[ITEM] {self.item_type} will disappear in {self.lifetime:.1f}s!")
-        
-        # Smooth floating animation with easing
-        self.float_timer += dt * 2.5
-        self.float_offset = math.sin(self.float_timer) * 4 + math.sin(self.float_timer * 2) * 1
-        
-        # Rotation animation (rare items spin)
-        if self.is_rare:
-            self.rotation += self.rotation_speed * dt
-            if self.rotation >= 360:
-                self.rotation -= 360
-        
-        # Glow pulse animation
-        self.glow_pulse += dt * 3
-        glow_intensity = (math.sin(self.glow_pulse) * 0.3 + 0.7)  # 0.4 to 1.0
-        
-        # Scale pulse for rare items
-        if self.is_rare:
-            self.scale_pulse = 1.0 + math.sin(self.float_timer * 1.5) * 0.1  # 0.9 to 1.1
-        
-        # Sparkle effects for rare items
-        if self.is_rare:
-            self.sparkle_timer += dt
-            if self.sparkle_timer >= 0.08:  # Spawn sparkle every 0.08s
-                self.sparkle_timer = 0
-                self._spawn_sparkle()
-        
-        # Update sparkles
-        for sparkle in self.sparkles[:]:
-            sparkle['lifetime'] -= dt
-            sparkle['y'] -= sparkle['speed'] * dt
-            sparkle['x'] += sparkle['drift'] * dt
-            sparkle['alpha'] = int(255 * max(0, sparkle['lifetime'] / sparkle['max_lifetime']))
-            
-            if sparkle['lifetime'] <= 0:
-                self.sparkles.remove(sparkle)
-        
-        # Gravity if not on ground
-        if not self.on_ground:
-            self.velocity_y += 800 * dt  # Gravity
-            if self.velocity_y > 400:
-                self.velocity_y = 400
-            
-            self.y += self.velocity_y * dt
-            
-            # Check collision with ground
-            grid_x = int(self.x // BLOCK_SIZE)
-            grid_y = int((self.y + self.height) // BLOCK_SIZE)
-            
-            block_below = world.get_block(grid_x, grid_y)
-            if block_below and block_below.is_solid():
-                self.y = grid_y * BLOCK_SIZE - self.height
-                self.velocity_y = 0
-                self.on_ground = True
-                
-                # Bounce effect on landing
-                if self.spawn_timer < 1.0:  # Only bounce when first landing
-                    self.velocity_y = -150
-                    self.on_ground = False
+        """Update a standalone item (items in the world's store are updated together)"""
+        self.store.advance(dt)
+        self.store.update(dt, world, np.array([self.slot]))
+    
+    def can_stack_with(self, other):
+        """Can another resting item be merged into this one?"""
+        return (other is not self and other.item_type == self.item_type and self.on_ground and
+                other.on_ground and self.stack + other.stack <= ITEM_STACK_MAX)
+    
+    def absorb(self, other):
+        """Merge another item's count into this stack (the caller removes the other)"""
+        self.stack += other.stack
+        self.lifetime = max(self.lifetime, other.lifetime)  # The fresher drop keeps the stack around
+        self.lifetime_warning = self.lifetime <= 2.0
     
     def can_collect(self, player):
         """Check if player is close enough to collect"""
@@ -467,10 +550,8 @@ class Item:
         
         return distance < collect_radius
     
-    def _spawn_sparkle(self):
-        """Create sparkle particle around item"""
-        import random
-        
+    def _emit_sparkles(self, pool, count):
+        """Create sparkle particles around item"""
         # Get item color for sparkles
         colors = {
             'magnet': (0, 255, 255),
@@ -491,35 +572,36 @@ class Item:
         
         color = colors.get(self.item_type, (255, 255, 255))
         
-        # Spawn sparkle in circular pattern
-        angle = random.uniform(0, math.pi * 2)
-        radius = random.uniform(8, 16)
-        
-        sparkle = {
-            'x': self.x + self.width / 2 + math.cos(angle) * radius,
-            'y': self.y + self.height / 2 + math.sin(angle) * radius,
-            'speed': random.uniform(20, 40),
-            'drift': random.uniform(-10, 10),
-            'lifetime': random.uniform(0.4, 0.8),
-            'max_lifetime': 0.8,
-            'alpha': 255,
-            'color': color,
-            'size': random.randint(1, 3)
-        }
-        self.sparkles.append(sparkle)
+        # Spawn sparkles in circular pattern, rising with a little drift
+        angles = np.random.uniform(0, math.pi * 2, count)
+        radii = np.random.uniform(8, 16, count)
+        pool.emit(count, STYLE_SPARKLE,
+                  self.x + self.width / 2 + np.cos(angles) * radii,
+                  self.y + self.height / 2 + np.sin(angles) * radii,
+                  velocity_x=np.random.uniform(-10, 10, count),
+                  velocity_y=-np.random.uniform(20, 40, count),
+                  lifetime=np.random.uniform(0.4, 0.8, count),
+                  max_lifetime=0.8,
+                  size=np.random.randint(1, 4, count),
+                  color=color)
+    
+    def get_age(self):
+        """Seconds since the item spawned"""
+        return self.store.now - self.born
     
     def get_render_y(self):
-        """Get Y position with floating offset"""
-        return self.y + self.float_offset
+        """Get Y position with smooth floating offset"""
+        float_timer = self.get_age() * 2.5
+        return self.y + math.sin(float_timer) * 4 + math.sin(float_timer * 2) * 1
     
     def get_glow_alpha(self):
         """Get current glow alpha for pulsing effect"""
-        return int((math.sin(self.glow_pulse) * 0.3 + 0.7) * 255)
+        return int((math.sin(self.get_age() * 3) * 0.3 + 0.7) * 255)  # 0.4 to 1.0
     
     def get_scale(self):
-        """Get current scale for pulsing effect"""
-        return self.scale_pulse if self.is_rare else 1.0
+        """Get current scale for pulsing effect (rare items, 0.9 to 1.1)"""
+        return 1.0 + math.sin(self.get_age() * 3.75) * 0.1 if self.is_rare else 1.0
     
     def get_rotation(self):
-        """Get current rotation angle"""
-        return self.rotation if self.is_rare else 0
+        """Get current rotation angle (rare items spin)"""
+        return self.get_age() * self.rotation_speed % 360 if self.is_rare else 0
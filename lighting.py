@@ -0,0 +1,182 @@
+"""
+Block lighting - per-chunk light maps flood-filled from glowing blocks
+Chunks are computed lazily and only invalidated around changed blocks
+"""
+
+from collections import deque
+import numpy as np
+from constants import *
+
+# Lookup table indexed by block id: emitted light level (0 = none)
+EMISSION_LUT = np.array([LIGHT_EMITTERS.get(block_type, 0) for block_type in BLOCK_TYPES], dtype=np.uint8)
+
+class LightMap:
+    """Light levels per chunk, propagated by BFS from emitting blocks"""
+
+    def __init__(self, world):
+        self.world = world
+        self.chunks = {}  # (cx, cy) -> uint8 light levels indexed [x, y]
+        self.versions = {}  # (cx, cy) -> change counter (for render caches)
+        self.emitters = {}  # (x, y) -> emitted light level
+        self.chunk_emitters = {}  # (cx, cy) -> {(x, y): level} for the emitters inside that chunk
+        self.emitter_levels = np.zeros((world.width, world.height), dtype=np.uint8)  # Same levels as a grid
+
+        self.ambient = self._build_ambient()
+        self._scan_emitters()
+
+        world.add_block_listener(self.on_blocks_changed)
+
+    def _build_ambient(self):
+        """Ambient light per row: daylight near the surface, dark deep down"""
+        ambient = np.zeros(self.world.height, dtype=np.uint8)
+        for y in range(self.world.height):
+            if y > BEDROCK_START:
+                ambient[y] = NETHER_AMBIENT_LIGHT
+            elif y <= STONE_START:
+                ambient[y] = MAX_LIGHT
+            else:
+                ambient[y] = max(0, MAX_LIGHT - (y - STONE_START) // LIGHT_DEPTH_FALLOFF)
+        return ambient
+
+    def _scan_emitters(self):
+        """Find every glowing block in the generated world"""
+        xs, ys = np.nonzero(EMISSION_LUT[self.world.block_grid])
+        for x, y in zip(xs.tolist(), ys.tolist()):
+            self._set_emitter(x, y, int(EMISSION_LUT[self.world.block_grid[x, y]]))
+
+    def _set_emitter(self, x, y, level):
+        """Add, change or (level 0) remove the emitter at a cell"""
+        chunk = (x // LIGHT_CHUNK_SIZE, y // LIGHT_CHUNK_SIZE)
+        self.emitter_levels[x, y] = level
+        if level:
+            self.emitters[(x, y)] = level
+            self.chunk_emitters.setdefault(chunk, {})[(x, y)] = level
+        else:
+            del self.emitters[(x, y)]
+            bucket = self.chunk_emitters[chunk]
+            del bucket[(x, y)]
+            if not bucket:
+                del self.chunk_emitters[chunk]
+
+    def _emitters_near(self, cx, cy):
+        """Emitters in the chunks within light reach of a chunk, as ((x, y), level)"""
+        reach = -(-MAX_LIGHT // LIGHT_CHUNK_SIZE)
+        for ny in range(cy - reach, cy + reach + 1):
+            for nx in range(cx - reach, cx + reach + 1):
+                bucket = self.chunk_emitters.get((nx, ny))
+                if bucket:
+                    yield from bucket.items()
+
+    def get_version(self, cx, cy):
+        """Get change counter for a chunk"""
+        return self.versions.get((cx, cy), 0)
+
+    def get_chunk(self, cx, cy):
+        """Get light levels for a chunk, computing them if needed"""
+        levels = self.chunks.get((cx, cy))
+        if levels is None:
+            levels = self._compute_chunk(cx, cy)
+            self.chunks[(cx, cy)] = levels
+        return levels
+
+    def on_blocks_changed(self, xs, ys):
+        """Invalidate chunks whose light may have changed"""
+        size = LIGHT_CHUNK_SIZE
+        changed_chunks = set(zip((xs // size).tolist(), (ys // size).tolist()))
+        emitter_changed = set()
+
+        # Glowing blocks placed, replaced or removed - plain stone or dirt changes are masked out first
+        levels = EMISSION_LUT[self.world.block_grid[xs, ys]]
+        differs = np.flatnonzero(levels != self.emitter_levels[xs, ys])
+        for x, y, level in zip(xs[differs].tolist(), ys[differs].tolist(), levels[differs].tolist()):
+            if self.emitters.get((x, y), 0) != level:  # A cell can be listed twice in one change
+                self._set_emitter(x, y, level)
+                emitter_changed.add((x // size, y // size))
+
+        # Light travels up to MAX_LIGHT blocks, so neighbours may change too
+        reach = -(-MAX_LIGHT // size)
+        for cx, cy in changed_chunks:
+            # Opening or closing space only matters if something glows nearby
+            if (cx, cy) not in emitter_changed and not self._has_emitters_near(cx, cy):
+                continue
+            for ny in range(cy - reach, cy + reach + 1):
+                for nx in range(cx - reach, cx + reach + 1):
+                    self.chunks.pop((nx, ny), None)
+                    self.versions[(nx, ny)] = self.versions.get((nx, ny), 0) + 1
+
+    def _has_emitters_near(self, cx, cy):
+        """Check if any emitter can reach the given chunk"""
+        x0, y0, x1, y1 = self._light_region(cx, cy)
+        for (x, y), _ in self._emitters_near(cx, cy):
+            if x0 <= x < x1 and y0 <= y < y1:
+                return True
+        return False
+
+    def _light_region(self, cx, cy):
+        """Chunk bounds expanded by the maximum light reach"""
+        size = LIGHT_CHUNK_SIZE
+        x0 = max(0, cx * size - MAX_LIGHT)
+        y0 = max(0, cy * size - MAX_LIGHT)
+        x1 = min(self.world.width, (cx + 1) * size + MAX_LIGHT)
+        y1 = min(self.world.height, (cy + 1) * size + MAX_LIGHT)
+        return x0, y0, x1, y1
+
+    def _compute_chunk(self, cx, cy):
+        """Combine ambient light with BFS light from nearby emitters"""
+        size = LIGHT_CHUNK_SIZE
+        x0 = cx * size
+        y0 = cy * size
+        x1 = min(x0 + size, self.world.width)
+        y1 = min(y0 + size, self.world.height)
+        if x1 <= x0 or y1 <= y0:
+            return np.zeros((0, 0), dtype=np.uint8)
+
+        levels = np.repeat(self.ambient[np.newaxis, y0:y1], x1 - x0, axis=0)
+
+        # Flood light outwards from every emitter that can reach this chunk
+        rx0, ry0, rx1, ry1 = self._light_region(cx, cy)
+        light = {}
+        queue = deque()
+        for (x, y), level in self._emitters_near(cx, cy):
+            if rx0 <= x < rx1 and ry0 <= y < ry1:
+                light[(x, y)] = level
+                queue.append((x, y))
+
+        while queue:
+            x, y = queue.popleft()
+            next_level = light[(x, y)] - 1
+            if next_level <= 0:
+                continue
+
+            # Solid blocks are lit on their face but stop the light
+            if (x, y) not in self.emitters:
+                block = self.world.get_block(x, y)
+                if block and block.is_solid():
+                    continue
+
+            for nx, ny in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+                if rx0 <= nx < rx1 and ry0 <= ny < ry1 and light.get((nx, ny), 0) < next_level:
+                    light[(nx, ny)] = next_level
+                    queue.append((nx, ny))
+
+        for (x, y), level in light.items():
+            if x0 <= x < x1 and y0 <= y < y1 and level > levels[x - x0, y - y0]:
+                levels[x - x0, y - y0] = level
+
+        return levels
+
+    def get_dynamic_lights(self, player=None):
+        """Get moving light sources as (world_x, world_y, radius_px)"""
+        lights = []
+        if player:
+            lights.append((player.x + player.width / 2,
+                           player.y + player.height / 2,
+                           PLAYER_LIGHT_RADIUS * BLOCK_SIZE))
+
+        # Fresh explosions light up their surroundings, fading with the animation
+        for explosion in self.world.explosions:
+            fade = 1.0 - explosion.frame / explosion.max_frames
+            if fade > 0:
+                lights.append((explosion.x, explosion.y,
+                               EXPLOSION_LIGHT_RADIUS * BLOCK_SIZE * fade))
+        return lights
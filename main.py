@@ -107,7 +107,7 @@ class Game:
                     # Random fuse time for staggered explosions (Minecraft-style)
                     import random
                     fuse_time = random.uniform(2.0, 4.0)  # 2-4 seconds
-                    self.world.spawn_tnt(self.player.x, self.player.y, fuse_time=fuse_time, power_level=self.player.tnt_power_level)
+                    self.world.tnt_spawner.request(self.player.x, self.player.y, fuse_time=fuse_time, power_level=self.player.tnt_power_level)
                 elif event.key == pygame.K_RSHIFT or event.key == pygame.K_LSHIFT:
                     # Share/Production mode: Spawn multiple TNT rapidly
                     import random
@@ -115,7 +115,7 @@ class Game:
                         offset_x = random.uniform(-40, 40)
                         offset_y = random.uniform(-20, 20)
                         fuse_time = random.uniform(1.5, 5.0)  # Varied fuse times
-                        self.world.spawn_tnt(
+                        self.world.tnt_spawner.request(
                             self.player.x + offset_x,
                             self.player.y + offset_y,
                             fuse_time=fuse_time,
@@ -270,6 +270,9 @@ class Game:
         # Render world with camera offset
         self.renderer.render_world(self.world, camera_x, camera_y)
         
+        # Render meteor trails and item sparkles
+        self.renderer.render_effects(self.world, camera_x, camera_y)
+        
         # Render meteors (behind player but in front of blocks)
         self.renderer.render_meteors(self.world, camera_x, camera_y)
         
@@ -279,6 +282,9 @@ class Game:
         # Render player with debug mode
         self.renderer.render_player(self.player, camera_x, camera_y, self.debug_mode)
         
+        # Darken caves and the Nether (glowstone, lava, explosions and player give light)
+        self.renderer.render_lighting(self.world, self.player, camera_x, camera_y)
+        
         # Render meteor shower indicator
         self.renderer.render_meteor_shower_indicator(self.world)
         
@@ -1,14 +1,86 @@
 """
 Meteor entity - Beautiful falling space rocks
+Meteor state lives in a MeteorStore so the whole shower advances in one step
 """
 import random
 import math
+import numpy as np
+from entity_store import EntityStore, slot_field
+from emitters import Emitter, STYLE_GLOW
 from constants import BLOCK_SIZE
 
+class MeteorStore(EntityStore):
+    """Struct-of-arrays meteor state, one slot per live meteor"""
+    
+    # Per-slot arrays (name -> dtype); Meteor exposes each one as an attribute
+    FIELDS = {
+        'x': np.float64,
+        'y': np.float64,
+        'width': np.int32,
+        'height': np.int32,
+        'velocity_x': np.float64,
+        'velocity_y': np.float64,
+        'rotation': np.float64,
+        'rotation_speed': np.float64,
+        'glow_pulse': np.float64,
+        'age': np.float64,
+        'alive': bool,
+        'landed': bool,
+        'lod_dt': np.float64,  # Time waited for a reduced-rate update (see update_lod)
+    }
+    
+    def update(self, dt, world=None, slots=None):
+        """
+        Move every live meteor (or just the given slots) in one step
+        Returns the meteors that hit the ground or the bottom of the world
+        """
+        if slots is None:
+            slots = np.arange(self.count)
+        slots = slots[self.alive[slots]]
+        if not len(slots):
+            return []
+        
+        self.age[slots] += dt
+        
+        # Gentle rotation and glow pulse
+        self.rotation[slots] += self.rotation_speed[slots] * dt
+        self.glow_pulse[slots] += dt * 3
+        
+        step_xs = self.velocity_x[slots] * dt
+        step_ys = self.velocity_y[slots] * dt
+        if world is None:
+            self.x[slots] += step_xs
+            self.y[slots] += step_ys
+            return []
+        
+        # Swept through the grid (a handful at a time - one call each)
+        sweep = world.solid_grid.sweep
+        for slot, x, y, width, height, step_x, step_y in zip(
+                slots.tolist(), self.x[slots].tolist(), self.y[slots].tolist(), self.width[slots].tolist(),
+                self.height[slots].tolist(), step_xs.tolist(), step_ys.tolist()):
+            self.x[slot], self.y[slot], hit_x, hit_y = sweep(x, y, width, height, step_x, step_y)
+            self.landed[slot] = bool(hit_x or hit_y)
+        
+        # Create trail particles
+        meteors = self.get_owners(slots)
+        for meteor in meteors:
+            meteor.trail.update(dt, world.effects)
+        
+        # Ran into a block, or out of the bottom of the world
+        impact = self.landed[slots] | (self.y[slots] // BLOCK_SIZE >= world.height - 1)
+        return [meteor for meteor, hit in zip(meteors, impact.tolist()) if hit]
+
 class Meteor:
-    """A beautiful falling meteor with glowing trail"""
+    """A beautiful falling meteor with glowing trail (a view onto its MeteorStore slot)"""
+    
+    def __init__(self, x, y, store=None):
+        # Trail particles (emitted into the world's effect pool)
+        self.trail = Emitter(self._emit_trail, 0.05)
+        self.reset(x, y, store)
     
-    def __init__(self, x, y):
+    def reset(self, x, y, store=None):
+        """(Re)initialize as a new meteor - also used when reused from a pool"""
+        (store if store is not None else MeteorStore(1)).add(self)  # Sets self.store and self.slot
         self.x = x
         self.y = y
         self.width = 12
@@ -23,9 +95,7 @@ class Meteor:
         self.rotation_speed = random.uniform(-60, 60)
         self.glow_pulse = random.uniform(0, math.pi * 2)
         
-        # Trail particles
-        self.trail_particles = []
-        self.trail_timer = 0
+        self.trail.reset()
         
         # Meteor color variation (orange to cyan)
         self.color_type = random.choice(['orange', 'cyan', 'purple', 'yellow'])
@@ -33,54 +103,37 @@ class Meteor:
         # State
         self.alive = True
         self.age = 0
-        
-    def update(self, dt):
+        self.landed = False  # Swept into a solid block this frame
+    
+    # State held in the store
+    x = slot_field('x')
+    y = slot_field('y')
+    width = slot_field('width')
+    height = slot_field('height')
+    velocity_x = slot_field('velocity_x')
+    velocity_y = slot_field('velocity_y')
+    rotation = slot_field('rotation')
+    rotation_speed = slot_field('rotation_speed')
+    glow_pulse = slot_field('glow_pulse')
+    age = slot_field('age')
+    alive = slot_field('alive')
+    landed = slot_field('landed')
+    
+    def update(self, dt, world=None):
         """Update meteor position and effects"""
-        if not self.alive:
-            return
-            
-        self.age += dt
-        
-        # Apply velocity
-        self.x += self.velocity_x * dt
-        self.y += self.velocity_y * dt
-        
-        # Gentle rotation
-        self.rotation += self.rotation_speed * dt
-        
-        # Glow pulse
-        self.glow_pulse += dt * 3
-        
-        # Create trail particles
-        self.trail_timer += dt
-        if self.trail_timer > 0.05:  # Every 50ms (less frequent for elegance)
-            self.trail_timer = 0
-            self._create_trail_particle()
-        
-        # Update trail particles
-        for particle in self.trail_particles[:]:
-            particle['life'] -= dt
-            particle['y'] += particle['vy'] * dt
-            particle['x'] += particle['vx'] * dt
-            particle['alpha'] = max(0, particle['life'] / particle['max_life'])
-            
-            if particle['life'] <= 0:
-                self.trail_particles.remove(particle)
+        self.store.update(dt, world, np.array([self.slot]))
     
-    def _create_trail_particle(self):
-        """Create a glowing trail particle"""
-        particle = {
-            'x': self.x + self.width / 2 + random.uniform(-2, 2),
-            'y': self.y + self.height / 2 + random.uniform(-2, 2),
-            'vx': random.uniform(-10, 10),
-            'vy': random.uniform(-20, 0),  # Float up slightly
-            'life': random.uniform(0.6, 1.2),  # Longer life for more trails
-            'max_life': 1.2,
-            'alpha': 1.0,
-            'size': random.uniform(3, 6),  # Bigger particles
-            'color': self.color_type
-        }
-        self.trail_particles.append(particle)
+    def _emit_trail(self, pool, count):
+        """Create glowing trail particles"""
+        pool.emit(count, STYLE_GLOW,
+                  self.x + self.width / 2 + np.random.uniform(-2, 2, count),
+                  self.y + self.height / 2 + np.random.uniform(-2, 2, count),
+                  velocity_x=np.random.uniform(-10, 10, count),
+                  velocity_y=np.random.uniform(-20, 0, count),  # Float up slightly
+                  lifetime=np.random.uniform(0.6, 1.2, count),  # Longer life for more trails
+                  max_lifetime=1.2,
+                  size=np.random.uniform(3, 6, count),  # Bigger particles
+                  color=self.get_color_rgb())
     
     def get_block_pos(self):
         """Get meteor's block position"""
@@ -90,9 +143,8 @@ class Meteor:
         """Check if meteor should impact with ground"""
         block_x, block_y = self.get_block_pos()
         
-        # Check block below
-        below_block = world.get_block(block_x, block_y + 1)
-        if below_block and below_block.is_solid():
+        # Ran into a block on the last sweep
+        if self.landed:
             return True
             
         # Check if out of bounds (bottom of world)
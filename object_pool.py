@@ -0,0 +1,49 @@
+"""
+Object pools for frequently spawned entities
+Released objects are kept and handed out again through their reset() method,
+so steady-state play reuses entities instead of allocating new ones
+"""
+
+from constants import OBJECT_POOL_LIMIT
+
+class ObjectPool:
+    """Free list of reusable objects of one type"""
+
+    def __init__(self, factory, limit=OBJECT_POOL_LIMIT):
+        self.factory = factory  # Called with the acquire() arguments when the pool is empty
+        self.limit = limit  # Free objects kept at most (extras are left to the GC)
+        self.free = []
+
+        # Metrics
+        self.created = 0
+        self.reused = 0
+        self.released = 0
+        self.discarded = 0
+
+    def acquire(self, *args):
+        """Get an object set up with args - reset() on a pooled one, or a new one"""
+        if self.free:
+            obj = self.free.pop()
+            obj.reset(*args)
+            self.reused += 1
+            return obj
+        self.created += 1
+        return self.factory(*args)
+
+    def release(self, obj):
+        """Give an object back once nothing uses it any more"""
+        self.released += 1
+        if len(self.free) < self.limit:
+            self.free.append(obj)
+        else:
+            self.discarded += 1
+
+    def get_stats(self):
+        """Pool metrics"""
+        return {
+            'created': self.created,
+            'reused': self.reused,
+            'in_use': self.created + self.reused - self.released,
+            'free': len(self.free),
+            'discarded': self.discarded,
+        }
@@ -1,49 +1,246 @@
 """
 Particle system for visual effects
+Particles live in preallocated NumPy arrays and are integrated in one step;
+dead particles are compacted by moving live ones from the end into their slots.
+Emission goes through a ParticleBudget that thins requests near the cap.
+Particles bounce off solid cells, and ones that come to rest become static
+decals that fade out without costing simulation or budget
 """
 
-import random
-from constants import GRAVITY
-
-class Particle:
-    """Individual particle for debris effects"""
-    
-    def __init__(self, x, y, color):
-        self.x = x
-        self.y = y
-        self.color = color
-        
-        # Random velocity
-        self.velocity_x = random.uniform(-100, 100)
-        self.velocity_y = random.uniform(-150, -50)
-        
-        # Lifetime
-        self.lifetime = random.uniform(0.5, 1.5)
-        self.max_lifetime = self.lifetime
-        
-        # Size
-        self.size = random.randint(2, 4)
-    
+import numpy as np
+from particle_budget import ParticleBudget
+from constants import (GRAVITY, PARTICLE_CAPACITY, PARTICLE_EFFECT, PARTICLE_OFFSCREEN_AGING, PARTICLE_BOUNCE,
+                       PARTICLE_FRICTION, PARTICLE_SETTLE_SPEED, PARTICLE_DECAL_CAPACITY, PARTICLE_DECAL_LIFETIME,
+                       BLOCK_SIZE)
+
+class DecalLayer:
+    """Ring buffer of settled particles - static squares that fade out"""
+
+    def __init__(self, capacity=PARTICLE_DECAL_CAPACITY):
+        self.capacity = capacity
+        self.head = 0  # Next slot to write (the oldest decal is overwritten when full)
+        self.x = np.zeros(capacity)
+        self.y = np.zeros(capacity)
+        self.size = np.zeros(capacity, dtype=np.int32)
+        self.color = np.zeros((capacity, 3), dtype=np.uint8)
+        self.lifetime = np.zeros(capacity)  # <= 0 means the slot is empty
+        self.support_x = np.zeros(capacity, dtype=np.intp)  # Grid cell the decal rests on
+        self.support_y = np.zeros(capacity, dtype=np.intp)
+
+    def __len__(self):
+        return int(np.count_nonzero(self.lifetime > 0))
+
+    def add(self, xs, ys, sizes, colors, fades, support_xs, support_ys):
+        """
+        Store settled particles, overwriting the oldest decals when full
+        fades is each particle's remaining lifetime fraction - the decal carries on from it
+        """
+        count = min(len(xs), self.capacity)
+        if not count:
+            return
+        slots = (self.head + np.arange(count)) % self.capacity
+        self.x[slots] = xs[-count:]
+        self.y[slots] = ys[-count:]
+        self.size[slots] = sizes[-count:]
+        self.color[slots] = colors[-count:]
+        self.lifetime[slots] = PARTICLE_DECAL_LIFETIME * np.clip(fades[-count:], 0, 1)
+        self.support_x[slots] = support_xs[-count:]
+        self.support_y[slots] = support_ys[-count:]
+        self.head = (self.head + count) % self.capacity
+
+    def drop_unsupported(self, xs, ys, solid_grid):
+        """Remove decals resting on changed cells (xs, ys) that are no longer solid"""
+        live = self.get_live()
+        if not len(live):
+            return
+        height = solid_grid.height
+        on_changed = np.isin(self.support_x[live] * height + self.support_y[live], xs * height + ys)
+        live = live[on_changed]
+        if len(live):
+            loose = solid_grid.grid[self.support_x[live], self.support_y[live]] == 0
+            self.lifetime[live[loose]] = 0
+
     def update(self, dt):
-        """Update particle position"""
-        # Apply gravity
-        self.velocity_y += GRAVITY * dt * 0.5  # Half gravity for particles
-        
-        # Update position
-        self.x += self.velocity_x * dt
-        self.y += self.velocity_y * dt
-        
-        # Update lifetime
+        """Fade every decal"""
         self.lifetime -= dt
-        
+
+    def get_live(self):
+        """Slots holding a visible decal"""
+        return np.flatnonzero(self.lifetime > 0)
+
+    def get_alpha(self, slots):
+        """Alpha per decal slot based on remaining fade time"""
+        return (255 * self.lifetime[slots] / PARTICLE_DECAL_LIFETIME).astype(np.int32)
+
+class ParticleSystem:
+    """Struct-of-arrays debris/spark particles"""
+
+    def __init__(self, capacity=PARTICLE_CAPACITY):
+        self.capacity = capacity
+        self.count = 0  # Live particles occupy slots [0, count)
+        self.rng = np.random.default_rng()
+        self.budget = ParticleBudget()
+        self.decals = DecalLayer()  # Particles that came to rest
+
+        self.x = np.zeros(capacity)
+        self.y = np.zeros(capacity)
+        self.velocity_x = np.zeros(capacity)
+        self.velocity_y = np.zeros(capacity)
+        self.lifetime = np.zeros(capacity)
+        self.max_lifetime = np.ones(capacity)
+        self.size = np.zeros(capacity, dtype=np.int32)
+        self.color = np.zeros((capacity, 3), dtype=np.uint8)
+
+    def __len__(self):
+        return self.count
+
+    def admit(self, count, priority, x, y):
+        """Ask the budget how many of count particles an emitter at (x, y) may add"""
+        return self.budget.admit(count, priority, self.count, x, y)
+
+    def emit(self, count, x, y, color, velocity_x=None, velocity_y=None, lifetime=None, size=None,
+             max_lifetime=None, priority=PARTICLE_EFFECT):
+        """
+        Add up to count particles - every value is a scalar or an array of length count
+        Velocity, lifetime and size default to the classic random debris spread;
+        max_lifetime (for the fade) defaults to the starting lifetime.
+        The budget may thin the request (priority None = already admitted)
+        """
+        if priority is not None and count > 0:
+            allowed = self.admit(count, priority, float(np.mean(x)), float(np.mean(y)))
+            if allowed < count:
+                # Keep the first particles of any per-particle values
+                x, y, velocity_x, velocity_y, lifetime, size, max_lifetime = (
+                    value if value is None or np.ndim(value) == 0 else np.asarray(value)[:allowed]
+                    for value in (x, y, velocity_x, velocity_y, lifetime, size, max_lifetime))
+                color = np.asarray(color)
+                if color.ndim == 2:
+                    color = color[:allowed]
+                count = allowed
+        if count <= 0:
+            return
+        if self.count + count > self.capacity:
+            self._grow(self.count + count)
+
+        rng = self.rng
+        if velocity_x is None:
+            velocity_x = rng.uniform(-100, 100, count)
+        if velocity_y is None:
+            velocity_y = rng.uniform(-150, -50, count)
+        if lifetime is None:
+            lifetime = rng.uniform(0.5, 1.5, count)
+        if size is None:
+            size = rng.integers(2, 5, count)
+
+        new = slice(self.count, self.count + count)
+        self.x[new] = x
+        self.y[new] = y
+        self.velocity_x[new] = velocity_x
+        self.velocity_y[new] = velocity_y
+        self.lifetime[new] = lifetime
+        self.max_lifetime[new] = lifetime if max_lifetime is None else max_lifetime
+        self.size[new] = size
+        self.color[new] = color
+        self.count += count
+
+    def _grow(self, needed):
+        """Enlarge the arrays to hold at least needed particles"""
+        capacity = self.capacity
+        while capacity < needed:
+            capacity *= 2
+        for name in ('x', 'y', 'velocity_x', 'velocity_y', 'lifetime', 'max_lifetime', 'size', 'color'):
+            array = getattr(self, name)
+            grown = np.zeros((capacity,) + array.shape[1:], dtype=array.dtype)
+            grown[:self.capacity] = array
+            setattr(self, name, grown)
+        self.capacity = capacity
+
+    def update(self, dt, solid_grid=None):
+        """Integrate every live particle, bounce it off solid cells and drop the dead ones"""
+        self.decals.update(dt)
+        n = self.count
+        if not n:
+            return
+
+        # Apply gravity (half gravity for particles)
+        self.velocity_y[:n] += GRAVITY * dt * 0.5
+
+        # Update position
+        old_xs = self.x[:n].copy()
+        old_ys = self.y[:n].copy()
+        self.x[:n] += self.velocity_x[:n] * dt
+        self.y[:n] += self.velocity_y[:n] * dt
+
+        if solid_grid is not None:
+            self._collide(solid_grid, old_xs, old_ys)
+
+        # Update lifetime (off-screen particles burn out faster)
+        visible = self.budget.get_visible_mask(self.x[:n], self.y[:n])
+        self.lifetime[:n] -= np.where(visible, dt, dt * PARTICLE_OFFSCREEN_AGING)
+
         # Apply drag
-        self.velocity_x *= 0.98
-        self.velocity_y *= 0.98
-    
-    def is_dead(self):
-        """Check if particle should be removed"""
-        return self.lifetime <= 0
-    
+        self.velocity_x[:n] *= 0.98
+        self.velocity_y[:n] *= 0.98
+
+        self._compact()
+
+    def _collide(self, solid_grid, old_xs, old_ys):
+        """Bounce particles that moved into a solid cell; slow ones landing on top settle as decals"""
+        n = self.count
+        hit, _, _ = solid_grid.solid_at(self.x[:n], self.y[:n])
+        if not hit.any():
+            return
+        started_inside, _, _ = solid_grid.solid_at(old_xs, old_ys)
+        hit &= ~started_inside  # Debris spawned inside a block flies free instead of sticking
+        hits = np.flatnonzero(hit)
+        if not len(hits):
+            return
+
+        # Which axis of the move ran into the block (both for a corner)
+        old_x, old_y = old_xs[hits], old_ys[hits]
+        vertical, _, _ = solid_grid.solid_at(old_x, self.y[hits])
+        horizontal, _, _ = solid_grid.solid_at(self.x[hits], old_y)
+        corner = ~vertical & ~horizontal
+        flip_y = hits[vertical | corner]
+        flip_x = hits[horizontal | corner]
+        falling = self.velocity_y[flip_y] > 0
+        landing_ys = self.y[flip_y]  # Inside the block that stopped them
+
+        # Back out of the block and bounce, losing speed along the surface
+        self.y[flip_y] = old_ys[flip_y]
+        self.velocity_y[flip_y] *= -PARTICLE_BOUNCE
+        self.velocity_x[flip_y] *= PARTICLE_FRICTION
+        self.x[flip_x] = old_xs[flip_x]
+        self.velocity_x[flip_x] *= -PARTICLE_BOUNCE
+
+        # Landed with too little bounce left - becomes a decal
+        settling = falling & (np.abs(self.velocity_y[flip_y]) < PARTICLE_SETTLE_SPEED)
+        settled = flip_y[settling]
+        if len(settled):
+            fades = self.lifetime[settled] / self.max_lifetime[settled]
+            support_xs = (old_xs[settled] // BLOCK_SIZE).astype(np.intp)
+            support_ys = (landing_ys[settling] // BLOCK_SIZE).astype(np.intp)
+            self.decals.add(self.x[settled], self.y[settled], self.size[settled], self.color[settled],
+                            fades, support_xs, support_ys)
+            self.lifetime[settled] = 0  # Removed by the compaction pass
+
+    def _compact(self):
+        """Swap-remove dead particles (order is not kept)"""
+        n = self.count
+        dead = np.flatnonzero(self.lifetime[:n] <= 0)
+        if not len(dead):
+            return
+
+        # Live particles past the new end fill the dead slots before it
+        keep = n - len(dead)
+        holes = dead[dead < keep]
+        movers = keep + np.flatnonzero(self.lifetime[keep:n] > 0)
+        for array in (self.x, self.y, self.velocity_x, self.velocity_y,
+                      self.lifetime, self.max_lifetime, self.size, self.color):
+            array[holes] = array[movers]
+        self.count = keep
+
     def get_alpha(self):
-        """Get alpha value based on lifetime"""
-        return int(255 * (self.lifetime / self.max_lifetime))
+        """Alpha per live particle based on lifetime"""
+        n = self.count
+        return (255 * self.lifetime[:n] / self.max_lifetime[:n]).astype(np.int32)
@@ -0,0 +1,59 @@
+"""
+Particle budget manager
+Keeps the live particle count under a global cap: ambient effects thin out
+first, gameplay feedback last, and emitters off screen get a fraction of
+their particles (which also age faster)
+"""
+
+import numpy as np
+from constants import (PARTICLE_BUDGET, PARTICLE_PRIORITY_THINNING, PARTICLE_OFFSCREEN_EMISSION,
+                       PARTICLE_OFFSCREEN_MARGIN, SCREEN_WIDTH, SCREEN_HEIGHT)
+
+class ParticleBudget:
+    """Decides how many requested particles may actually be emitted"""
+
+    def __init__(self, cap=PARTICLE_BUDGET):
+        self.cap = cap
+        self.view = None  # Visible world rect (left, top, right, bottom), None = everything visible
+
+        # Emission stats per priority: requested / emitted
+        self.requested = {priority: 0 for priority in PARTICLE_PRIORITY_THINNING}
+        self.emitted = {priority: 0 for priority in PARTICLE_PRIORITY_THINNING}
+
+    def set_view(self, camera_x, camera_y, width=SCREEN_WIDTH, height=SCREEN_HEIGHT):
+        """Track the visible area (padded by the off-screen margin)"""
+        margin = PARTICLE_OFFSCREEN_MARGIN
+        self.view = (camera_x - margin, camera_y - margin,
+                     camera_x + width + margin, camera_y + height + margin)
+
+    def is_visible(self, x, y):
+        """Is a world position inside the padded view?"""
+        if self.view is None:
+            return True
+        left, top, right, bottom = self.view
+        return left <= x <= right and top <= y <= bottom
+
+    def get_visible_mask(self, xs, ys):
+        """Visibility of arrays of world positions"""
+        if self.view is None:
+            return np.ones(len(xs), dtype=bool)
+        left, top, right, bottom = self.view
+        return (xs >= left) & (xs <= right) & (ys >= top) & (ys <= bottom)
+
+    def admit(self, count, priority, live, x, y):
+        """Particles allowed out of count for an emitter at (x, y) with live particles alive"""
+        self.requested[priority] += count
+
+        # Off-screen emitters only get a fraction
+        if not self.is_visible(x, y):
+            count = int(count * PARTICLE_OFFSCREEN_EMISSION[priority])
+
+        # Thin linearly from the priority's threshold down to nothing at the cap
+        fill = live / self.cap
+        start = PARTICLE_PRIORITY_THINNING[priority]
+        if fill > start:
+            count = int(count * max(0.0, (1.0 - fill) / (1.0 - start)) + 0.5)
+
+        count = max(0, min(count, self.cap - live))
+        self.emitted[priority] += count
+        return count
@@ -765,15 +765,21 @@ class Player:
         if self.velocity_y > TERMINAL_VELOCITY:
             self.velocity_y = TERMINAL_VELOCITY
         
-        # Update position
-        self.x += self.velocity_x * dt
-        self.y += self.velocity_y * dt
+        # Update position (swept through the grid so large dt cannot tunnel)
+        self.x, self.y, hit_x, hit_y = world.solid_grid.sweep(self.x, self.y, self.width, self.height,
+                                                          self.velocity_x * dt, self.velocity_y * dt)
+        if hit_x:
+            self.velocity_x = 0
+        if hit_y:
+            self.velocity_y = 0
         
         # Apply friction
         self.velocity_x *= 0.8
         
-        # Check collisions
+        # Check collisions (push out of blocks that appeared inside the player)
         self._check_collisions(world)
+        if hit_y > 0:
+            self.on_ground = True
         
         # Auto-mining below player
         if self.on_ground:
@@ -800,47 +806,15 @@ class Player:
         """Check and resolve collisions with blocks"""
         self.on_ground = False
         
-        # Get player grid bounds
-        left = int(self.x // BLOCK_SIZE)
-        right = int((self.x + self.width) // BLOCK_SIZE)
-        top = int(self.y // BLOCK_SIZE)
-        bottom = int((self.y + self.height) // BLOCK_SIZE)
-        
-        # Check surrounding blocks
-        for by in range(max(0, top - 1), min(world.height, bottom + 2)):
-            for bx in range(max(0, left - 1), min(world.width, right + 2)):
-                block = world.get_block(bx, by)
-                
-                if block and block.is_solid():
-                    block_rect = pygame.Rect(bx * BLOCK_SIZE, by * BLOCK_SIZE, 
-                                            BLOCK_SIZE, BLOCK_SIZE)
-                    player_rect = pygame.Rect(self.x, self.y, self.width, self.height)
-                    
-                    if player_rect.colliderect(block_rect):
-                        # Resolve collision
-                        overlap_x = min(player_rect.right - block_rect.left,
-                                       block_rect.right - player_rect.left)
-                        overlap_y = min(player_rect.bottom - block_rect.top,
-                                       block_rect.bottom - player_rect.top)
-                        
-                        if overlap_x < overlap_y:
-                            # Push horizontally
-                            if player_rect.centerx < block_rect.centerx:
-                                self.x -= overlap_x + 0.1  # Add small buffer
-                            else:
-                                self.x += overlap_x + 0.1
-                            self.velocity_x = 0
-                        else:
-                            # Push vertically
-                            if player_rect.centery < block_rect.centery:
-                                self.y -= overlap_y + 0.1  # Add small buffer
-                                if self.velocity_y >= 0:  # Only set ground if falling down
-                                    self.velocity_y = 0
-                                    self.on_ground = True
-                            else:
-                                self.y += overlap_y + 0.1
-                                if self.velocity_y <= 0:  # Hit ceiling
-                                    self.velocity_y = 0
+        # Push out of any solid cells the hitbox overlaps
+        self.x, self.y, push_x, push_y = world.solid_grid.resolve_aabb(self.x, self.y, self.width, self.height)
+        if push_x:
+            self.velocity_x = 0
+        if push_y < 0 and self.velocity_y >= 0:  # Only set ground if falling down
+            self.velocity_y = 0
+            self.on_ground = True
+        elif push_y > 0 and self.velocity_y <= 0:  # Hit ceiling
+            self.velocity_y = 0
     
     def _auto_mine(self, dt, world):
         """Automatically mine blocks directly below player"""
@@ -3,8 +3,12 @@ Renderer for blocks, player, TNT, and particles
 """
 
 import pygame
+import numpy as np
 from texture_generator import texture_gen
-from constants import BLOCK_SIZE, SCREEN_WIDTH, SCREEN_HEIGHT
+from emitters import Emitter, EffectPool, STYLE_SNOW, STYLE_STREAK
+from constants import (BLOCK_SIZE, SCREEN_WIDTH, SCREEN_HEIGHT, LIGHT_CHUNK_SIZE,
+                       MAX_LIGHT, DARKNESS_MAX_ALPHA, LIGHT_OVERLAY_CACHE_SIZE,
+                       PARTICLE_ALPHA_BUCKETS, PARTICLE_SPRITE_CACHE_SIZE)
 
 class Renderer:
     """Handles all rendering operations"""
@@ -15,12 +19,17 @@ class Renderer:
         # Night sky stars (generate once)
         self.stars = self._generate_stars()
         
-        # Shooting stars (dynamic)
-        self.shooting_stars = []
-        self.shooting_star_timer = 0
-        
-        # Snow particles
-        self.snow_particles = self._generate_snow()
+        # Snow and shooting stars share one screen-space effect pool
+        self.sky_effects = EffectPool()
+        self._emit_snow(self.sky_effects, 100)  # 100 snowflakes
+        self.shooting_star_emitter = Emitter(self._emit_shooting_stars, 2, 5)
+        
+        # Lighting: cached darkness overlay per chunk {(cx, cy): (version, Surface or None)}
+        self.light_overlays = {}
+        self.light_sprites = {}  # Radial light cut-outs by radius
+        self.lit_overlays = {}  # (cx, cy) -> (overlay, lights key, overlay with the dynamic lights cut out)
+        self.particle_sprites = {}  # Particle squares by packed (color, size, alpha bucket)
+        self.stack_labels = {}  # Rendered "xN" item stack counts by N
     
     def _generate_stars(self):
         """Generate random stars for night sky"""
@@ -63,119 +72,47 @@ class Renderer:
             else:
                 pygame.draw.circle(self.screen, color, (star['x'], star['y']), star['size'])
     
-    def _generate_snow(self):
+    def _emit_snow(self, pool, count):
         """Generate snow particles"""
-        import random
-        snow = []
-        for _ in range(100):  # 100 snowflakes
-            snow.append({
-                'x': random.randint(0, SCREEN_WIDTH),
-                'y': random.randint(-SCREEN_HEIGHT, SCREEN_HEIGHT),
-                'speed': random.uniform(20, 50),
-                'drift': random.uniform(-10, 10),
-                'size': random.choice([1, 1, 2]),
-                'opacity': random.uniform(0.5, 1.0)
-            })
-        return snow
+        pool.emit(count, STYLE_SNOW,
+                  np.random.randint(0, SCREEN_WIDTH + 1, count),
+                  np.random.randint(-SCREEN_HEIGHT, SCREEN_HEIGHT + 1, count),
+                  velocity_x=np.random.uniform(-10, 10, count),  # Drift
+                  velocity_y=np.random.uniform(20, 50, count),
+                  lifetime=1.0, max_lifetime=1.0,  # Snow never expires
+                  size=np.random.choice([1, 1, 2], count),
+                  color=(255, 255, 255))
     
     def update_background_effects(self, dt):
         """Update shooting stars and snow"""
-        import random
+        # Spawn shooting stars randomly (every 2-5 seconds)
+        self.shooting_star_emitter.update(dt, self.sky_effects)
         
-        # Update snow
-        for flake in self.snow_particles:
-            flake['y'] += flake['speed'] * dt
-            flake['x'] += flake['drift'] * dt
-            
-            # Wrap around
-            if flake['y'] > SCREEN_HEIGHT:
-                flake['y'] = -10
-                flake['x'] = random.randint(0, SCREEN_WIDTH)
-            if flake['x'] < 0:
-                flake['x'] = SCREEN_WIDTH
-            if flake['x'] > SCREEN_WIDTH:
-                flake['x'] = 0
-        
-        # Spawn shooting stars randomly
-        self.shooting_star_timer += dt
-        if self.shooting_star_timer > random.uniform(2, 5):  # Every 2-5 seconds
-            self.shooting_star_timer = 0
-            self._spawn_shooting_star()
-        
-        # Update shooting stars
-        for star in self.shooting_stars[:]:
-            star['x'] += star['vx'] * dt
-            star['y'] += star['vy'] * dt
-            star['life'] -= dt
-            
-            if star['life'] <= 0 or star['y'] > SCREEN_HEIGHT:
-                self.shooting_stars.remove(star)
+        # Snow and shooting stars move in one step
+        self.sky_effects.update(dt)
     
-    def _spawn_shooting_star(self):
-        """Spawn a shooting star"""
-        import random
-        
+    def _emit_shooting_stars(self, pool, count):
+        """Spawn shooting stars"""
         # Start from top-right area
-        start_x = random.randint(SCREEN_WIDTH // 2, SCREEN_WIDTH + 100)
-        start_y = random.randint(-50, SCREEN_HEIGHT // 3)
-        
-        self.shooting_stars.append({
-            'x': start_x,
-            'y': start_y,
-            'vx': random.uniform(-300, -200),  # Move left
-            'vy': random.uniform(100, 200),    # Move down
-            'life': random.uniform(1.0, 2.0),
-            'max_life': 2.0,
-            'length': random.uniform(30, 60)
-        })
+        pool.emit(count, STYLE_STREAK,
+                  np.random.randint(SCREEN_WIDTH // 2, SCREEN_WIDTH + 101, count),
+                  np.random.randint(-50, SCREEN_HEIGHT // 3 + 1, count),
+                  velocity_x=np.random.uniform(-300, -200, count),  # Move left
+                  velocity_y=np.random.uniform(100, 200, count),  # Move down
+                  lifetime=np.random.uniform(1.0, 2.0, count),
+                  max_lifetime=2.0,
+                  size=0,
+                  color=(255, 255, 255),
+                  length=np.random.uniform(30, 60, count))
     
     def render_background_effects(self):
         """Render snow and shooting stars (before everything)"""
-        import pygame
-        import math
-        
-        # Render snow
-        for flake in self.snow_particles:
-            alpha = int(255 * flake['opacity'])
-            color = (255, 255, 255)
-            
-            if flake['size'] == 1:
-                if 0 <= flake['x'] < SCREEN_WIDTH and 0 <= flake['y'] < SCREEN_HEIGHT:
-                    self.screen.set_at((int(flake['x']), int(flake['y'])), color)
-            else:
-                pygame.draw.circle(self.screen, color, 
-                                 (int(flake['x']), int(flake['y'])), flake['size'])
-        
-        # Render shooting stars
-        for star in self.shooting_stars:
-            alpha = int(255 * (star['life'] / star['max_life']))
-            
-            # Calculate trail end point
-            dx = star['vx'] / abs(star['vx']) if star['vx'] != 0 else 0
-            dy = star['vy'] / abs(star['vy']) if star['vy'] != 0 else 0
-            length = star['length']
-            
-            # Normalize direction
-            mag = math.sqrt(dx*dx + dy*dy)
-            if mag > 0:
-                dx /= mag
-                dy /= mag
-            
-            end_x = star['x'] + dx * length
-            end_y = star['y'] + dy * length
-            
-            # Draw gradient trail
-            for i in range(3):
-                offset = i * 0.3
-                fade = 1.0 - (i * 0.3)
-                color = (255, 255, 255)
-                width = max(1, 3 - i)
-                
-                pygame.draw.line(self.screen, color,
-                               (int(star['x'] + dx * offset), int(star['y'] + dy * offset)),
-                               (int(end_x + dx * offset), int(end_y + dy * offset)),
-                               width)
-        
+        self.sky_effects.render(self.screen)
+    
+    def render_effects(self, world, camera_x, camera_y):
+        """Render meteor trails and item sparkles"""
+        world.effects.render(self.screen, camera_x, camera_y)
+    
     def render_world(self, world, camera_x, camera_y):
         """Render visible blocks"""
         visible_blocks = world.get_visible_blocks(camera_x, camera_y, 
@@ -195,7 +132,7 @@ class Renderer:
                                        block.health / block.max_health)
         
         # Render TNT
-        for tnt in world.tnt_list:
+        for tnt in world.tnt_store:
             self._render_tnt(tnt, camera_x, camera_y)
         
         # Render items
@@ -206,9 +143,112 @@ class Renderer:
         for explosion in world.explosions:
             self._render_explosion(explosion, camera_x, camera_y)
         
-        # Render particles
-        for particle in world.particles:
-            self._render_particle(particle, camera_x, camera_y)
+        # Render particles (one batched blit)
+        self._render_particles(world.particles, camera_x, camera_y)
+    
+    def render_lighting(self, world, player, camera_x, camera_y):
+        """Darken unlit areas using cached per-chunk overlays"""
+        lighting = world.lighting
+        chunk_px = LIGHT_CHUNK_SIZE * BLOCK_SIZE
+        start_cx = max(0, int(camera_x // chunk_px))
+        start_cy = max(0, int(camera_y // chunk_px))
+        end_cx = int((camera_x + SCREEN_WIDTH) // chunk_px) + 1
+        end_cy = int((camera_y + SCREEN_HEIGHT) // chunk_px) + 1
+        
+        # Moving lights (player, explosions) snap to whole tiles in world space, so a
+        # chunk's cut-out overlay stays valid until a light crosses a tile
+        lights = []
+        for light_x, light_y, radius in lighting.get_dynamic_lights(player):
+            sprite = self._get_light_sprite(radius)
+            if sprite:
+                half = sprite.get_width() // 2
+                lights.append((sprite, int(light_x // BLOCK_SIZE) * BLOCK_SIZE - half,
+                               int(light_y // BLOCK_SIZE) * BLOCK_SIZE - half))
+        
+        overlays = []
+        for cy in range(start_cy, end_cy):
+            for cx in range(start_cx, end_cx):
+                overlay = self._get_light_overlay(lighting, cx, cy)
+                if not overlay:
+                    continue  # Fully lit chunk costs nothing
+                chunk_x = cx * chunk_px
+                chunk_y = cy * chunk_px
+                
+                # Lights overlapping this chunk, relative to it
+                touching = []
+                for sprite, sprite_x, sprite_y in lights:
+                    size = sprite.get_width()
+                    if (sprite_x < chunk_x + overlay.get_width() and sprite_x + size > chunk_x and
+                            sprite_y < chunk_y + overlay.get_height() and sprite_y + size > chunk_y):
+                        touching.append((sprite, sprite_x - chunk_x, sprite_y - chunk_y))
+                if touching:
+                    overlay = self._get_lit_overlay(cx, cy, overlay, touching)
+                overlays.append((overlay, (chunk_x - camera_x, chunk_y - camera_y)))
+        
+        if overlays:
+            self.screen.blits(overlays, doreturn=False)
+        
+        # Drop overlays far from the view so the cache stays bounded
+        if len(self.light_overlays) > LIGHT_OVERLAY_CACHE_SIZE:
+            for key in list(self.light_overlays):
+                if not (start_cx - 2 <= key[0] <= end_cx + 2 and start_cy - 2 <= key[1] <= end_cy + 2):
+                    del self.light_overlays[key]
+                    self.lit_overlays.pop(key, None)
+    
+    def _get_light_overlay(self, lighting, cx, cy):
+        """Get darkness overlay for a chunk (None if fully lit)"""
+        version = lighting.get_version(cx, cy)
+        cached = self.light_overlays.get((cx, cy))
+        if cached and cached[0] == version:
+            return cached[1]
+        
+        levels = lighting.get_chunk(cx, cy)
+        alpha = ((MAX_LIGHT - levels.astype(np.int16)) * DARKNESS_MAX_ALPHA // MAX_LIGHT).astype(np.uint8)
+        
+        overlay = None
+        if alpha.size and alpha.any():
+            small = pygame.Surface(alpha.shape, pygame.SRCALPHA)
+            small.fill((0, 0, 0, 255))
+            pixels = pygame.surfarray.pixels_alpha(small)
+            pixels[:] = alpha
+            del pixels  # Unlock surface
+            overlay = pygame.transform.scale(small, (alpha.shape[0] * BLOCK_SIZE,
+                                                     alpha.shape[1] * BLOCK_SIZE))
+        
+        self.light_overlays[(cx, cy)] = (version, overlay)
+        return overlay
+    
+    def _get_lit_overlay(self, cx, cy, overlay, touching):
+        """Get a chunk overlay with dynamic lights cut out (rebuilt only when a light moves a tile or resizes)"""
+        key = tuple((sprite.get_width(), x, y) for sprite, x, y in touching)
+        cached = self.lit_overlays.get((cx, cy))
+        if cached and cached[0] is overlay and cached[1] == key:
+            return cached[2]
+        
+        lit = overlay.copy()
+        for sprite, x, y in touching:
+            lit.blit(sprite, (x, y), special_flags=pygame.BLEND_RGBA_SUB)
+        self.lit_overlays[(cx, cy)] = (overlay, key, lit)
+        return lit
+    
+    def _get_light_sprite(self, radius):
+        """Get radial alpha cut-out for a dynamic light (cached by radius)"""
+        radius = int(radius) // 8 * 8  # Quantize so fading lights reuse sprites
+        if radius <= 0:
+            return None
+        if radius not in self.light_sprites:
+            size = radius * 2
+            coords = np.arange(size) - radius + 0.5
+            dist = np.sqrt(coords[:, np.newaxis] ** 2 + coords[np.newaxis, :] ** 2)
+            falloff = np.clip(1.0 - dist / radius, 0.0, 1.0)
+            
+            sprite = pygame.Surface((size, size), pygame.SRCALPHA)
+            sprite.fill((0, 0, 0, 255))
+            pixels = pygame.surfarray.pixels_alpha(sprite)
+            pixels[:] = (falloff * DARKNESS_MAX_ALPHA).astype(np.uint8)
+            del pixels  # Unlock surface
+            self.light_sprites[radius] = sprite
+        return self.light_sprites[radius]
     
     def _render_health_bar(self, x, y, health_ratio):
         """Render health bar above damaged block"""
@@ -283,31 +323,66 @@ class Renderer:
         pygame.draw.rect(self.screen, (0, 0, 0), bg_rect)
         self.screen.blit(fuse_text, text_rect)
     
-    def _render_particle(self, particle, camera_x, camera_y):
-        """Render single particle"""
-        screen_x = int(particle.x - camera_x)
-        screen_y = int(particle.y - camera_y)
-        
+    def _render_particles(self, particles, camera_x, camera_y):
+        """Render settled decals, then every live particle, from cached sprites"""
+        decals = particles.decals
+        slots = decals.get_live()
+        if len(slots):
+            self._blit_squares(decals.x[slots], decals.y[slots], decals.size[slots], decals.color[slots],
+                               decals.get_alpha(slots), camera_x, camera_y)
+        
+        n = particles.count
+        if n:
+            self._blit_squares(particles.x[:n], particles.y[:n], particles.size[:n], particles.color[:n],
+                               particles.get_alpha(), camera_x, camera_y)
+    
+    def _blit_squares(self, xs, ys, sizes, colors, alphas, camera_x, camera_y):
+        """Draw on-screen colored squares in one blits call"""
         # Only render if on screen
-        if (0 <= screen_x < SCREEN_WIDTH and 
-            0 <= screen_y < SCREEN_HEIGHT):
-            
-            # Create surface with alpha
-            size = particle.size
-            surf = pygame.Surface((size, size))
-            surf.fill(particle.color)
-            surf.set_alpha(particle.get_alpha())
-            
-            self.screen.blit(surf, (screen_x, screen_y))
+        screen_xs = (xs - camera_x).astype(np.int64)
+        screen_ys = (ys - camera_y).astype(np.int64)
+        visible = np.flatnonzero((screen_xs >= 0) & (screen_xs < SCREEN_WIDTH) &
+                                 (screen_ys >= 0) & (screen_ys < SCREEN_HEIGHT))
+        if not len(visible):
+            return
+        
+        # One sprite per (color, size, alpha bucket) - pack the three into one key
+        colors = colors[visible].astype(np.int64)
+        buckets = np.clip(alphas[visible], 0, 255) * PARTICLE_ALPHA_BUCKETS // 256
+        keys = ((((colors[:, 0] << 8 | colors[:, 1]) << 8 | colors[:, 2]) << 8 | sizes[visible]) << 8) | buckets
+        unique_keys, inverse = np.unique(keys, return_inverse=True)
+        sprites = [self._get_particle_sprite(key) for key in unique_keys.tolist()]
+        
+        self.screen.blits([(sprites[i], position) for i, position in
+                           zip(inverse.tolist(), zip(screen_xs[visible].tolist(), screen_ys[visible].tolist()))],
+                          doreturn=False)
+    
+    def _get_particle_sprite(self, key):
+        """Get (cached) filled square for a packed (color, size, alpha bucket) key"""
+        sprite = self.particle_sprites.get(key)
+        if sprite:
+            return sprite
+        
+        if len(self.particle_sprites) >= PARTICLE_SPRITE_CACHE_SIZE:
+            self.particle_sprites.clear()  # Rarely hit - cheaper than tracking use
+        
+        bucket = key & 0xFF
+        size = (key >> 8) & 0xFF
+        color = ((key >> 32) & 0xFF, (key >> 24) & 0xFF, (key >> 16) & 0xFF)
+        sprite = pygame.Surface((size, size))
+        sprite.fill(color)
+        sprite.set_alpha((bucket * 2 + 1) * 128 // PARTICLE_ALPHA_BUCKETS)  # Bucket middle
+        self.particle_sprites[key] = sprite
+        return sprite
     
     def _render_item(self, item, camera_x, camera_y):
         """Render collectible item with floating animation"""
+        # Only render if on screen (floating animation is only worked out for these)
         screen_x = int(item.x - camera_x)
+        if not -32 <= screen_x < SCREEN_WIDTH + 32 or not -48 <= item.y - camera_y < SCREEN_HEIGHT + 48:
+            return
         screen_y = int(item.get_render_y() - camera_y)
-        
-        # Only render if on screen
-        if (-32 <= screen_x < SCREEN_WIDTH + 32 and 
-            -32 <= screen_y < SCREEN_HEIGHT + 32):
+        if -32 <= screen_y < SCREEN_HEIGHT + 32:
             
             # Adjust position for glowing items (they have bigger texture)
             if item.texture.get_width() > BLOCK_SIZE:
@@ -522,40 +597,6 @@ class Renderer:
     def render_meteors(self, world, camera_x, camera_y):
         """Render meteors with beautiful glowing trails"""
         for meteor in world.meteors:
-            # Render trail particles first (behind meteor)
-            for particle in meteor.trail_particles:
-                screen_x = int(particle['x'] - camera_x)
-                screen_y = int(particle['y'] - camera_y)
-                
-                # Get color based on meteor type
-                color_map = {
-                    'orange': (255, 140, 50),
-                    'cyan': (80, 220, 255),
-                    'purple': (200, 80, 255),
-                    'yellow': (255, 240, 80)
-                }
-                base_color = color_map.get(particle['color'], (255, 140, 50))
-                
-                # Apply alpha
-                alpha = int(particle['alpha'] * 255)
-                size = int(particle['size'] * particle['alpha'])
-                
-                if size > 0:
-                    # Draw glowing particle
-                    glow_surf = pygame.Surface((size * 3, size * 3), pygame.SRCALPHA)
-                    
-                    # Outer glow
-                    for r in range(size * 3, size, -1):
-                        glow_alpha = int(alpha * (1 - (r - size) / (size * 2)))
-                        color = (*base_color, glow_alpha)
-                        pygame.draw.circle(glow_surf, color, (size * 3 // 2, size * 3 // 2), r)
-                    
-                    # Core
-                    core_color = tuple(min(255, c + 50) for c in base_color) + (alpha,)
-                    pygame.draw.circle(glow_surf, core_color, (size * 3 // 2, size * 3 // 2), max(1, size))
-                    
-                    self.screen.blit(glow_surf, (screen_x - size * 3 // 2, screen_y - size * 3 // 2))
-            
             # Render meteor body
             screen_x = int(meteor.x - camera_x)
             screen_y = int(meteor.y - camera_y)
@@ -677,16 +718,16 @@ class Renderer:
         time = pygame.time.get_ticks() / 1000.0
         
         for item in world.items:
-            # Calculate screen position with floating
+            # Skip if off-screen (with margin) - animation is only worked out for visible items
             screen_x = int(item.x - camera_x)
-            screen_y = int(item.get_render_y() - camera_y)
-            
-            # Skip if off-screen (with margin)
             if screen_x < -100 or screen_x > SCREEN_WIDTH + 100:
                 continue
-            if screen_y < -100 or screen_y > SCREEN_HEIGHT + 100:
+            if item.y - camera_y < -100 or item.y - camera_y > SCREEN_HEIGHT + 100:
                 continue
             
+            # Calculate screen position with floating
+            screen_y = int(item.get_render_y() - camera_y)
+            
             # === RARE ITEM SPECIAL EFFECTS ===
             if item.is_rare:
                 center_x = screen_x + item.width // 2
@@ -774,28 +815,6 @@ class Renderer:
                 # Blit glow surface
                 self.screen.blit(glow_surf, (center_x - 100, center_y - 100))
                 
-                # === SPARKLE PARTICLES ===
-                for sparkle in item.sparkles:
-                    s_x = int(sparkle['x'] - camera_x)
-                    s_y = int(sparkle['y'] - camera_y)
-                    
-                    if 0 <= s_x < SCREEN_WIDTH and 0 <= s_y < SCREEN_HEIGHT:
-                        # Sparkle with glow
-                        sparkle_glow = pygame.Surface((12, 12), pygame.SRCALPHA)
-                        sparkle_alpha = max(0, min(255, sparkle['alpha']))
-                        
-                        # Outer glow
-                        for glow_layer in range(3, 0, -1):
-                            layer_alpha = max(0, min(255, sparkle_alpha // (4 - glow_layer)))
-                            layer_color = sparkle['color'] + (layer_alpha // 2,)
-                            pygame.draw.circle(sparkle_glow, layer_color, (6, 6), glow_layer)
-                        
-                        # Bright center
-                        center_color = (255, 255, 255, sparkle['alpha'])
-                        pygame.draw.circle(sparkle_glow, center_color, (6, 6), sparkle['size'])
-                        
-                        self.screen.blit(sparkle_glow, (s_x - 6, s_y - 6))
-            
             # === RENDER ITEM TEXTURE ===
             # Get rotation and scale
             rotation = item.get_rotation()
@@ -863,4 +882,26 @@ class Renderer:
                 
                 self.screen.blit(glow_surf, (screen_x - 10, screen_y - 10))
                 self.screen.blit(item.texture, (screen_x, screen_y))
+            
+            # === STACK COUNT ===
+            if item.stack > 1:
+                label = self._get_stack_label(item.stack)
+                self.screen.blit(label, (screen_x + item.width - label.get_width() // 2,
+                                         screen_y + item.height - label.get_height()))
+    
+    def _get_stack_label(self, count):
+        """Get (cached) outlined "xN" label for an item stack"""
+        label = self.stack_labels.get(count)
+        if label:
+            return label
+        
+        font = pygame.font.Font(None, 16)
+        text = font.render(f"x{count}", True, (255, 255, 255))
+        shadow = font.render(f"x{count}", True, (0, 0, 0))
+        label = pygame.Surface((text.get_width() + 2, text.get_height() + 2), pygame.SRCALPHA)
+        for offset in ((0, 1), (2, 1), (1, 0), (1, 2)):
+            label.blit(shadow, offset)
+        label.blit(text, (1, 1))
+        self.stack_labels[count] = label
+        return label
 
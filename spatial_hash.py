@@ -0,0 +1,107 @@
+"""
+Uniform-grid spatial hash for moving entities
+Entities are bucketed by the cell their (x, y) falls in and re-bucketed only
+when they cross a cell boundary, so radius, rectangle and nearest queries
+look at nearby buckets instead of every entity
+"""
+
+from constants import SPATIAL_HASH_CELL_SIZE
+
+class SpatialHash:
+    """Buckets of entities keyed by (cell_x, cell_y)"""
+
+    def __init__(self, cell_size=SPATIAL_HASH_CELL_SIZE):
+        self.cell_size = cell_size
+        self.buckets = {}  # (cell_x, cell_y) -> list of entities
+        self.cells = {}  # entity -> the cell it is bucketed in
+
+    def __len__(self):
+        return len(self.cells)
+
+    def __contains__(self, entity):
+        return entity in self.cells
+
+    def _cell(self, x, y):
+        """Cell containing a pixel position"""
+        return int(x // self.cell_size), int(y // self.cell_size)
+
+    def insert(self, entity):
+        """Add an entity at its current position"""
+        cell = self._cell(entity.x, entity.y)
+        self.cells[entity] = cell
+        self.buckets.setdefault(cell, []).append(entity)
+
+    def remove(self, entity):
+        """Drop an entity (ignored if it is not in the hash)"""
+        cell = self.cells.pop(entity, None)
+        if cell is None:
+            return
+        bucket = self.buckets[cell]
+        bucket.remove(entity)
+        if not bucket:
+            del self.buckets[cell]
+
+    def move(self, entity):
+        """Re-bucket an entity after it moved (cheap when it stayed in its cell)"""
+        cell = self._cell(entity.x, entity.y)
+        old = self.cells.get(entity)
+        if old == cell:
+            return
+        if old is not None:
+            bucket = self.buckets[old]
+            bucket.remove(entity)
+            if not bucket:
+                del self.buckets[old]
+        self.cells[entity] = cell
+        self.buckets.setdefault(cell, []).append(entity)
+
+    def query_rect(self, x, y, width, height):
+        """Entities whose position lies inside a pixel rectangle"""
+        first_x, first_y = self._cell(x, y)
+        last_x, last_y = self._cell(x + width, y + height)
+        found = []
+        for cell_x in range(first_x, last_x + 1):
+            for cell_y in range(first_y, last_y + 1):
+                for entity in self.buckets.get((cell_x, cell_y), ()):
+                    if x <= entity.x <= x + width and y <= entity.y <= y + height:
+                        found.append(entity)
+        return found
+
+    def query_radius(self, x, y, radius):
+        """Entities whose position is within radius pixels of (x, y)"""
+        radius_sq = radius * radius
+        return [entity for entity in self.query_rect(x - radius, y - radius, radius * 2, radius * 2)
+                if (entity.x - x) ** 2 + (entity.y - y) ** 2 <= radius_sq]
+
+    def nearest(self, x, y, max_radius=None):
+        """Closest entity to (x, y) - searched ring by ring outwards (None if there is none in range)"""
+        if not self.cells:
+            return None
+
+        center_x, center_y = self._cell(x, y)
+        nearest = None
+        best_sq = float('inf') if max_radius is None else max_radius * max_radius
+        seen = 0
+        ring = 0
+        while seen < len(self.cells):
+            # Everything past this ring is at least ring cells away
+            reach = (ring - 1) * self.cell_size
+            if ring > 0 and reach * reach >= best_sq:
+                break
+
+            for cell_x in range(center_x - ring, center_x + ring + 1):
+                # Only the border of the square is new
+                step = 1 if ring == 0 or cell_x in (center_x - ring, center_x + ring) else 2 * ring
+                for cell_y in range(center_y - ring, center_y + ring + 1, step):
+                    bucket = self.buckets.get((cell_x, cell_y))
+                    if not bucket:
+                        continue
+                    seen += len(bucket)
+                    for entity in bucket:
+                        distance_sq = (entity.x - x) ** 2 + (entity.y - y) ** 2
+                        if distance_sq < best_sq or (nearest is None and distance_sq == best_sq):
+                            best_sq = distance_sq
+                            nearest = entity
+            ring += 1
+
+        return nearest
@@ -10,6 +10,7 @@ class Statistics:
         self.blocks_mined = 0
         self.total_depth = 0
         self.deepest_depth = 0
+        self.blocks_blasted = 0  # Destroyed by explosions
         
         # Item stats
         self.items_collected = 0
@@ -56,30 +57,34 @@ class Statistics:
         if depth >= 100:
             self.unlock_achievement("Abyss Explorer", "Reach depth 100")
     
-    def on_item_collected(self, item_type):
-        """Called when an item is collected"""
-        self.items_collected += 1
+    def on_blocks_blasted(self, counts):
+        """Called with {block_type: count} destroyed by an explosion"""
+        self.blocks_blasted += sum(counts.values())
+    
+    def on_item_collected(self, item_type, count=1):
+        """Called when an item (or a stack of count items) is collected"""
+        self.items_collected += count
         
         if item_type in ['magnet', 'double_jump', 'speed_boost', 'shield', 'block_breaker', 
                          'crystal', 'rare_ore', 'heart']:
-            self.rare_items_collected += 1
+            self.rare_items_collected += count
         
         if item_type == 'coal_ore':
-            self.coal_collected += 1
+            self.coal_collected += count
         elif item_type == 'iron_ore':
-            self.iron_collected += 1
+            self.iron_collected += count
         elif item_type == 'gold_ore':
-            self.gold_collected += 1
+            self.gold_collected += count
         elif item_type == 'diamond_ore':
-            self.diamond_collected += 1
+            self.diamond_collected += count
             self.unlock_achievement("Diamond Hunter", "Collect a diamond")
         elif item_type == 'heart':
-            self.hearts_collected += 1
+            self.hearts_collected += count
         
-        # Achievements
-        if self.items_collected == 50:
+        # Achievements (a stack can step past the exact threshold)
+        if self.items_collected >= 50:
             self.unlock_achievement("Collector", "Collect 50 items")
-        if self.rare_items_collected == 10:
+        if self.rare_items_collected >= 10:
             self.unlock_achievement("Treasure Hunter", "Collect 10 rare items")
     
     def on_death(self):
@@ -123,6 +128,7 @@ class Statistics:
         """Get statistics summary as dict"""
         return {
             'blocks_mined': self.blocks_mined,
+            'blocks_blasted': self.blocks_blasted,
             'deepest_depth': self.deepest_depth,
             'items_collected': self.items_collected,
             'rare_items': self.rare_items_collected,
@@ -1,16 +1,164 @@
 """
 TNT entity with physics and explosion
+Fuses run from scheduled deadlines and resting TNT sleeps until its support changes
+TNT state lives in struct-of-arrays storage so all falling TNT moves in one vectorized step
+(fast or sideways movers are swept through the grid so they cannot tunnel)
 """
 
+import heapq
 import pygame
 import random
+import numpy as np
+from entity_store import EntityStore, slot_field
 from sound_generator import sound_gen, SOUND_ENABLED
 from constants import *
 
+class FuseScheduler:
+    """Game clock plus a heap of fuse deadlines (no per-frame fuse countdown)"""
+    
+    def __init__(self):
+        self.now = 0.0
+        self.heap = []  # (deadline, sequence, tnt) - stale entries skipped on pop
+        self.sequence = 0
+    
+    def advance(self, dt):
+        """Move the clock forward"""
+        self.now += dt
+    
+    def schedule(self, tnt):
+        """Queue a TNT at its current deadline"""
+        self.sequence += 1
+        heapq.heappush(self.heap, (tnt.fuse_deadline, self.sequence, tnt))
+    
+    def pop_due(self):
+        """Get every live TNT whose fuse has run out"""
+        due = []
+        seen = set()  # A fuse set twice to the same deadline has two entries
+        while self.heap and self.heap[0][0] <= self.now:
+            deadline, _, tnt = heapq.heappop(self.heap)
+            # Skip entries replaced by a newer deadline or already exploded
+            if deadline == tnt.fuse_deadline and not tnt.exploded and id(tnt) not in seen:
+                seen.add(id(tnt))
+                due.append(tnt)
+        return due
+
+class TNTStore(EntityStore):
+    """Struct-of-arrays TNT state, one slot per live TNT"""
+    
+    # Per-slot arrays (name -> dtype); TNT exposes each one as an attribute
+    FIELDS = {
+        'x': np.float64,
+        'y': np.float64,
+        'velocity_x': np.float64,
+        'velocity_y': np.float64,
+        'width': np.int32,
+        'height': np.int32,
+        'power_level': np.int32,
+        'fuse_deadline': np.float64,
+        'on_ground': bool,
+        'is_falling': bool,
+        'has_landed': bool,
+        'sleeping': bool,
+        'lod_dt': np.float64,  # Time waited for a reduced-rate update (see update_lod)
+    }
+    
+    def update(self, dt, world, slots=None):
+        """
+        Integrate every awake TNT (or just the given slots) in one step
+        Returns the slots that moved (resting TNT is put to sleep instead)
+        """
+        if slots is None:
+            slots = np.flatnonzero(~self.sleeping[:self.count])
+        if not len(slots):
+            return slots
+        
+        # Support check below each TNT
+        height = self.height[slots]
+        solid, grid_xs, grid_ys = world.solid_grid.solid_at(self.x[slots], self.y[slots] + height)
+        
+        # On ground but no block below - start falling
+        lost = self.on_ground[slots] & ~solid
+        if lost.any():
+            self.on_ground[slots[lost]] = False
+            self.is_falling[slots[lost]] = True
+            for _ in range(int(lost.sum())):
+                print(f"[TNT] Block destroyed below! Falling...")
+        
+        # Resting TNT doesn't move - sleep until the support changes
+        resting = self.on_ground[slots]
+        for slot, grid_x, grid_y in zip(slots[resting].tolist(), grid_xs[resting].tolist(),
+                                        grid_ys[resting].tolist()):
+            world.sleep_tnt(self.owners[slot], (grid_x, grid_y))
+        slots = slots[~resting]
+        if not len(slots):
+            return slots
+        
+        # Apply gravity
+        velocity_y = np.minimum(self.velocity_y[slots] + GRAVITY * dt, TERMINAL_VELOCITY)
+        self.velocity_y[slots] = velocity_y
+        step_xs = self.velocity_x[slots] * dt
+        step_ys = velocity_y * dt
+        
+        # Short straight drops cannot skip a cell and are checked in one batch;
+        # sideways, upward and over-a-block moves are swept through the grid
+        swept = (step_xs != 0) | (step_ys < 0) | (step_ys >= BLOCK_SIZE)
+        landed = np.zeros(len(slots), dtype=bool)
+        
+        dropping = slots[~swept]
+        self.y[dropping] += step_ys[~swept]
+        height = self.height[dropping]
+        solid, grid_xs, grid_ys = world.solid_grid.solid_at(self.x[dropping], self.y[dropping] + height)
+        self.y[dropping[solid]] = grid_ys[solid] * BLOCK_SIZE - height[solid]  # Snap onto ground
+        landed[~swept] = solid
+        
+        moving = slots[swept]
+        if len(moving):
+            sweep = world.solid_grid.sweep
+            results = [sweep(x, y, width, height, step_x, step_y)
+                       for x, y, width, height, step_x, step_y in zip(
+                           self.x[moving].tolist(), self.y[moving].tolist(),
+                           self.width[moving].tolist(), self.height[moving].tolist(),
+                           step_xs[swept].tolist(), step_ys[swept].tolist())]
+            xs, ys, hit_xs, hit_ys = (np.array(column) for column in zip(*results))
+            self.x[moving] = xs
+            self.y[moving] = ys
+            self.velocity_x[moving[hit_xs != 0]] = 0  # Hit a wall
+            self.velocity_y[moving[hit_ys < 0]] = 0  # Hit a ceiling
+            landed[swept] = hit_ys > 0
+        
+        # Apply friction to horizontal velocity (settle to exactly zero once it is negligible)
+        self.velocity_x[slots] *= 0.95
+        self.velocity_x[slots[np.abs(self.velocity_x[slots]) < TNT_REST_SPEED]] = 0
+        
+        landing = slots[landed]
+        self.on_ground[slots[~landed]] = False
+        if not len(landing):
+            return slots
+        
+        # Land on ground
+        self.velocity_y[landing] = 0
+        self.velocity_x[landing] *= 0.5  # Reduce horizontal velocity on landing
+        self.is_falling[landing] = False
+        self.on_ground[landing] = True
+        first = landing[~self.has_landed[landing]]
+        self.has_landed[first] = True
+        for slot in first.tolist():
+            print(f"[TNT] Landed! Exploding in {self.owners[slot].fuse_time:.1f}s")
+        return slots
+
 class TNT:
-    """TNT block that falls and explodes"""
+    """TNT block that falls and explodes (a view onto its TNTStore slot)"""
+    
+    def __init__(self, x, y, fuse_time=None, power_level=0, scheduler=None, store=None):
+        self.reset(x, y, fuse_time, power_level, scheduler, store)
     
-    def __init__(self, x, y, fuse_time=None, power_level=0):
+    def reset(self, x, y, fuse_time=None, power_level=0, scheduler=None, store=None):
+        """(Re)initialize as a freshly lit TNT - also used when reused from a pool"""
+        self.scheduler = scheduler or FuseScheduler()
+        (store if store is not None else TNTStore(1)).add(self)  # Sets self.store and self.slot
+        self.exploded = False
+        self.support = None  # Grid cell holding a sleeping TNT up
+        
         self.x = x
         self.y = y
         self.power_level = power_level  # TNT power level from player
@@ -34,54 +182,35 @@ class TNT:
         self.is_falling = True
         self.last_beep_time = self.fuse_time
         self.has_landed = False
+    
+    # State held in the store
+    x = slot_field('x')
+    y = slot_field('y')
+    velocity_x = slot_field('velocity_x')
+    velocity_y = slot_field('velocity_y')
+    width = slot_field('width')
+    height = slot_field('height')
+    power_level = slot_field('power_level')
+    fuse_deadline = slot_field('fuse_deadline')
+    on_ground = slot_field('on_ground')
+    is_falling = slot_field('is_falling')
+    has_landed = slot_field('has_landed')
+    sleeping = slot_field('sleeping')  # Resting on ground - no physics until woken
+    lod_dt = slot_field('lod_dt')  # Time owed by the update LOD
         
+    @property
+    def fuse_time(self):
+        """Seconds left on the fuse"""
+        return self.fuse_deadline - self.scheduler.now
+    
+    @fuse_time.setter
+    def fuse_time(self, value):
+        self.fuse_deadline = self.scheduler.now + value
+        self.scheduler.schedule(self)
+    
     def update(self, dt, world):
-        """Update TNT state"""
-        # Update fuse timer
-        self.fuse_time -= dt
-        
-        # Check if block below exists (for gravity)
-        grid_x = int(self.x // BLOCK_SIZE)
-        grid_y = int((self.y + self.height) // BLOCK_SIZE)
-        block_below = world.get_block(grid_x, grid_y)
-        
-        # If on ground but no block below, start falling
-        if self.on_ground and (not block_below or not block_below.is_solid()):
-            self.on_ground = False
-            self.is_falling = True
-            print(f"[TNT] Block destroyed below! Falling...")
-        
-        if self.is_falling or not self.on_ground:
-            # Apply gravity
-            self.velocity_y += GRAVITY * dt
-            if self.velocity_y > TERMINAL_VELOCITY:
-                self.velocity_y = TERMINAL_VELOCITY
-            
-            # Update position (horizontal and vertical)
-            self.x += self.velocity_x * dt
-            self.y += self.velocity_y * dt
-            
-            # Apply friction to horizontal velocity
-            self.velocity_x *= 0.95
-            
-            # Check collision with ground
-            grid_x = int(self.x // BLOCK_SIZE)
-            grid_y = int((self.y + self.height) // BLOCK_SIZE)
-            
-            # Check block below
-            block_below = world.get_block(grid_x, grid_y)
-            if block_below and block_below.is_solid():
-                # Land on ground
-                self.y = grid_y * BLOCK_SIZE - self.height
-                self.velocity_y = 0
-                self.velocity_x *= 0.5  # Reduce horizontal velocity on landing
-                self.is_falling = False
-                self.on_ground = True
-                if not self.has_landed:
-                    self.has_landed = True
-                    print(f"[TNT] Landed! Exploding in {self.fuse_time:.1f}s")
-            else:
-                self.on_ground = False
+        """Update TNT state (not called while sleeping)"""
+        self.store.update(dt, world, np.array([self.slot]))
     
     def should_explode(self):
         """Check if TNT should explode"""
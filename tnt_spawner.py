@@ -0,0 +1,94 @@
+"""
+TNT admission control
+Spawn requests beyond the live TNT cap are queued, merged into stronger TNT
+near the same spot, or dropped, so a TNT flood keeps frame time bounded
+"""
+
+from constants import (BLOCK_SIZE, MAX_SIMULTANEOUS_TNT, TNT_SPAWN_QUEUE_LIMIT,
+                       TNT_MERGE_RADIUS, TNT_MAX_MERGED_POWER)
+
+class TNTSpawner:
+    """Front door for World.spawn_tnt that enforces the concurrent TNT cap"""
+
+    def __init__(self, world):
+        self.world = world
+        self.pending = []  # Waiting requests [x, y, fuse_time, power_level, on_spawn], oldest first
+        self.buckets = {}  # Merge cell -> pending request (latest one in that cell)
+
+        # Request counters
+        self.spawned = 0
+        self.merged = 0
+        self.dropped = 0
+        self.rejected = 0  # Refused by the world (spawn spot is solid)
+
+    @property
+    def queued(self):
+        """Requests waiting for a free TNT slot"""
+        return len(self.pending)
+
+    def get_stats(self):
+        """Counts of spawned, queued, merged, dropped and rejected requests (they add up to all requests)"""
+        return {
+            'spawned': self.spawned,
+            'queued': self.queued,
+            'merged': self.merged,
+            'dropped': self.dropped,
+            'rejected': self.rejected,
+        }
+
+    def request(self, x, y, fuse_time=None, power_level=0, on_spawn=None):
+        """
+        Ask for a TNT - spawned now if under the cap, otherwise queued, merged or dropped
+        on_spawn(tnt) is called if and when the world actually places it
+        """
+        if not self.pending and len(self.world.tnt_store) < MAX_SIMULTANEOUS_TNT:
+            self._spawn(x, y, fuse_time, power_level, on_spawn)
+            return
+
+        # Fold into a waiting TNT near the same spot
+        cell = self._get_cell(x, y)
+        target = self.buckets.get(cell)
+        if target and target[3] < TNT_MAX_MERGED_POWER:
+            target[3] = min(TNT_MAX_MERGED_POWER, max(target[3], power_level) + 1)
+            self.merged += 1
+            return
+
+        if len(self.pending) >= TNT_SPAWN_QUEUE_LIMIT:
+            self.dropped += 1
+            if self.dropped % 100 == 1:
+                print(f"[TNT] Spawn queue full - {self.dropped} requests dropped so far")
+            return
+
+        pending = [x, y, fuse_time, power_level, on_spawn]
+        self.pending.append(pending)
+        self.buckets[cell] = pending
+
+    def update(self):
+        """Admit queued requests as live TNT slots free up"""
+        free = MAX_SIMULTANEOUS_TNT - len(self.world.tnt_store)
+        if not self.pending or free <= 0:
+            return
+
+        admitted, self.pending = self.pending[:free], self.pending[free:]
+        for request in admitted:
+            self._spawn(*request)
+
+        # Admitted requests can no longer take merges
+        self.buckets = {}
+        for pending in self.pending:
+            self.buckets[self._get_cell(pending[0], pending[1])] = pending
+
+    def _get_cell(self, x, y):
+        """Merge cell for a world position"""
+        cell_size = TNT_MERGE_RADIUS * BLOCK_SIZE
+        return (int(x // cell_size), int(y // cell_size))
+
+    def _spawn(self, x, y, fuse_time, power_level, on_spawn=None):
+        """Hand an admitted request to the world"""
+        tnt = self.world.spawn_tnt(x, y, fuse_time, power_level)
+        if tnt:
+            self.spawned += 1
+            if on_spawn:
+                on_spawn(tnt)
+        else:
+            self.rejected += 1
@@ -0,0 +1,73 @@
+"""
+Distance-based update level of detail
+Entities far outside the view are simulated every few frames instead of every
+frame; each slot keeps the time it has been waiting and gets all of it on its
+next tick, so it covers the same game time. Slots are staggered across frames
+so a far tier does not tick all at once
+"""
+
+import numpy as np
+from constants import SCREEN_WIDTH, SCREEN_HEIGHT, UPDATE_LOD_TIERS
+
+class UpdateLOD:
+    """Chooses which slots of an entity store tick this frame and with how much dt"""
+
+    def __init__(self):
+        self.view = None  # Visible world rect (left, top, right, bottom), None = everything at full rate
+        self.frame = 0
+
+        # Stats: slot updates run / put off
+        self.ticked = 0
+        self.deferred = 0
+
+    def set_view(self, camera_x, camera_y, width=SCREEN_WIDTH, height=SCREEN_HEIGHT):
+        """Track the visible area tiers are measured from"""
+        self.view = (camera_x, camera_y, camera_x + width, camera_y + height)
+
+    def advance(self):
+        """Start a new frame (moves the stagger)"""
+        self.frame += 1
+
+    def get_intervals(self, xs, ys):
+        """Frames between updates for arrays of world positions (1 = every frame)"""
+        intervals = np.ones(len(xs), dtype=np.int64)
+        if self.view is None:
+            return intervals
+
+        # Distance outside the view along the worse axis (negative inside it)
+        left, top, right, bottom = self.view
+        distance = np.maximum(np.maximum(left - xs, xs - right), np.maximum(top - ys, ys - bottom))
+        for min_distance, interval in UPDATE_LOD_TIERS:
+            intervals[distance >= min_distance] = interval
+        return intervals
+
+    def schedule(self, store, dt, active=None):
+        """
+        Add dt to the wait of every live (or active-masked) slot of a store and
+        return the batches due this frame as [(elapsed, slots)]
+        """
+        n = store.count
+        slots = np.arange(n) if active is None else np.flatnonzero(active)
+        if not len(slots):
+            return []
+        store.lod_dt[slots] += dt
+
+        intervals = self.get_intervals(store.x[slots], store.y[slots])
+        due = slots[(self.frame + slots) % intervals == 0]
+        self.ticked += len(due)
+        self.deferred += len(slots) - len(due)
+        if not len(due):
+            return []
+        elapsed = store.lod_dt[due]
+        store.lod_dt[due] = 0
+
+        # Slots of a tier and phase waited the same frames - one batch per distinct wait
+        values, inverse = np.unique(elapsed, return_inverse=True)
+        return [(value, due[inverse == i]) for i, value in enumerate(values.tolist())]
+
+    def get_stats(self):
+        """Slot updates run and put off so far"""
+        return {
+            'ticked': self.ticked,
+            'deferred': self.deferred,
+        }
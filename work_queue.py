@@ -0,0 +1,43 @@
+"""
+Frame-budgeted work queue
+Deferred cosmetic work (particles, animations, drops) is drained a little
+every frame so one big event does not stall a single frame
+"""
+
+import time
+from collections import deque
+
+class WorkQueue:
+    """FIFO of deferred jobs drained under a per-frame time budget"""
+
+    def __init__(self, budget_ms):
+        self.budget_ms = budget_ms
+        self.jobs = deque()  # (callback, args)
+        self.idle_jobs = deque()  # Background jobs, run only when jobs is empty
+
+    def push(self, callback, *args):
+        """Queue callback(*args) to run on a later drain"""
+        self.jobs.append((callback, args))
+
+    def push_idle(self, callback, *args):
+        """Queue low-priority callback(*args) for frames with spare budget"""
+        self.idle_jobs.append((callback, args))
+
+    def drain(self):
+        """Run queued jobs until the frame budget is used up"""
+        if not self.jobs and not self.idle_jobs:
+            return 0
+
+        # Always run at least one job so the queue keeps moving
+        deadline = time.perf_counter() + self.budget_ms / 1000.0
+        done = 0
+        while self.jobs or self.idle_jobs:
+            callback, args = (self.jobs or self.idle_jobs).popleft()
+            callback(*args)
+            done += 1
+            if time.perf_counter() >= deadline:
+                break
+        return done
+
+    def __len__(self):
+        return len(self.jobs) + len(self.idle_jobs)
@@ -4,13 +4,24 @@ Handles block grid, TNT, and particle systems
 """
 
 import random
-import math
-from block import Block
-from tnt import TNT
-from particle import Particle
-from explosion import Explosion
-from item import Item
-from meteor import Meteor
+import numpy as np
+from block import Block, SHARED_BLOCKS
+from tnt import TNT, TNTStore, FuseScheduler
+from tnt_spawner import TNTSpawner
+from particle import ParticleSystem
+from emitters import EffectPool
+from item import Item, ItemStore
+from meteor import Meteor, MeteorStore
+from falling_blocks import FallingBlockSystem
+from lighting import LightMap
+from crater import CraterEngine
+from explosion_resolver import ExplosionResolver
+from collision import SolidGrid
+from spatial_hash import SpatialHash
+from work_queue import WorkQueue
+from explosion import Explosion, frame_jobs, prepare_frame
+from object_pool import ObjectPool
+from update_lod import UpdateLOD
 from sound_generator import sound_gen, SOUND_ENABLED
 from constants import *
 
@@ -20,17 +31,36 @@ class World:
     def __init__(self):
         self.width = CHUNK_WIDTH
         self.height = WORLD_HEIGHT
-        self.blocks = {}  # Dict for sparse storage {(x,y): Block}
-        self.tnt_list = []
-        self.particles = []
+        # Block ids stored column-major in a bytearray (fast single-cell reads),
+        # exposed as a numpy [x, y] view for vectorized operations
+        self.block_bytes = bytearray(self.width * self.height)
+        self.block_grid = np.frombuffer(self.block_bytes, dtype=np.uint8).reshape(self.width, self.height)
+        self.damaged_blocks = {}  # Blocks with their own health state {(x,y): Block}
+        self.tnt_store = TNTStore()  # Every live TNT (array-backed physics state)
+        self.tnt_hash = SpatialHash()  # Live TNT by position (neighbour and nearest lookups)
+        self.fuse_scheduler = FuseScheduler()  # Game clock and TNT fuse deadlines
+        self.sleeping_tnt = {}  # Support cell (x, y) -> list of TNT resting on it
+        self.particles = ParticleSystem()  # Array-backed debris and spark particles
+        self.effects = EffectPool()  # Meteor trails and item sparkles
         self.explosions = []  # Explosion animations
-        self.items = []  # Collectible items
-        self.meteors = []  # Meteor shower
+        
+        # Reused entity objects (finished ones are released back)
+        self.tnt_pool = ObjectPool(TNT)
+        self.item_pool = ObjectPool(Item)
+        self.meteor_pool = ObjectPool(Meteor)
+        self.explosion_pool = ObjectPool(Explosion)
+        self.items = ItemStore()  # Collectible items (array-backed state)
+        self.item_hash = SpatialHash()  # Items by position (pickup and nearest lookups)
+        self.sleeping_items = {}  # Support cell (x, y) -> list of items resting on it
+        self.support_counts = np.zeros((self.width, self.height), dtype=np.int32)  # Sleepers resting on each cell
+        self.meteors = MeteorStore()  # Meteor shower (array-backed state)
+        self.update_lod = UpdateLOD()  # Far-off entities tick every few frames
         
         # TNT spawning system
         self.tnt_spawn_timer = 0
         self.tnt_spawn_interval = TNT_SPAWN_INTERVAL
         self.total_tnt_spawned = 0
+        self.tnt_spawner = TNTSpawner(self)  # Caps live TNT - every spawn request goes through it
         
         # Meteor shower system (rare event)
         self.meteor_shower_timer = 0
@@ -39,9 +69,32 @@ class World:
         self.meteor_shower_duration = 0
         self.meteor_spawn_timer = 0
         
+        # Block change listeners - called with arrays of changed cells (xs, ys)
+        self.block_listeners = []
+        
+        # Vectorized crater carving (cached radius masks)
+        self.crater_engine = CraterEngine()
+        self.explosion_resolver = ExplosionResolver(self)
+        self.effect_queue = WorkQueue(EXPLOSION_WORK_BUDGET_MS)  # Deferred cosmetic work
+        
+        # Draw the shared explosion frames in the background, a few per frame
+        for job in frame_jobs():
+            self.effect_queue.push_idle(prepare_frame, *job)
+        
         # Generate initial world
         self._generate_world()
         
+        # Solid-cell map for collision (kept current before any other listener runs)
+        self.solid_grid = SolidGrid(self)
+        self.add_block_listener(self.solid_grid.on_blocks_changed)
+        
+        # Loose blocks (sand) fall when their support is removed
+        self.falling_blocks = FallingBlockSystem(self)
+        
+        # Light maps for glowstone/lava (computed per chunk on demand)
+        self.lighting = LightMap(self)
+        self.add_block_listener(self._on_support_changed)
+        
         # Spawn test pickaxes (for demonstration)
         self._spawn_test_items()
     
@@ -63,7 +116,7 @@ class World:
             for y in range(self.height):
                 block_type = self._determine_block_type(x, y)
                 if block_type != 'air':
-                    self.blocks[(x, y)] = Block(block_type, x, y)
+                    self.block_grid[x, y] = BLOCK_IDS[block_type]
         
         print(f"World generated: {self.width}x{self.height} blocks")
     
@@ -190,29 +243,63 @@ class World:
         """Get block at grid position"""
         if x < 0 or x >= self.width or y < 0 or y >= self.height:
             return None
-        return self.blocks.get((x, y), None)
+        block_id = self.block_bytes[x * self.height + y]
+        if not block_id:
+            return None
+        return self.damaged_blocks.get((x, y)) or SHARED_BLOCKS[block_id]
     
     def set_block(self, x, y, block_type):
         """Set block at grid position"""
         if x < 0 or x >= self.width or y < 0 or y >= self.height:
             return
         
-        if block_type == 'air' or block_type is None:
-            if (x, y) in self.blocks:
-                del self.blocks[(x, y)]
-        else:
-            self.blocks[(x, y)] = Block(block_type, x, y)
+        block_id = BLOCK_IDS[block_type] if block_type else 0
+        if self.block_bytes[x * self.height + y] == block_id:
+            return  # Nothing changed
+        
+        self.block_bytes[x * self.height + y] = block_id
+        self.damaged_blocks.pop((x, y), None)
+        
+        self._notify_block_changes(np.array([x]), np.array([y]))
+    
+    def clear_blocks(self, xs, ys):
+        """Remove many blocks at once (arrays of grid coordinates)"""
+        if len(xs) == 0:
+            return
+        
+        self.block_grid[xs, ys] = 0
+        
+        # Forget health of damaged blocks that were just removed
+        for cell in [cell for cell in self.damaged_blocks if self.block_grid[cell] == 0]:
+            del self.damaged_blocks[cell]
+        
+        self._notify_block_changes(xs, ys)
+    
+    def add_block_listener(self, callback):
+        """Register callback(xs, ys) to be told about changed block cells"""
+        self.block_listeners.append(callback)
+    
+    def _notify_block_changes(self, xs, ys):
+        """Tell listeners which cells changed (numpy arrays of grid coords)"""
+        for callback in self.block_listeners:
+            callback(xs, ys)
     
     def mine_block_at(self, x, y, damage, game=None):
         """
         Apply damage to block at position
         Returns True if block was destroyed
         """
+        x, y = int(x), int(y)
         block = self.get_block(x, y)
         
         if not block or not block.is_mineable():
             return False
         
+        # Shared undamaged block - give this cell its own health
+        if (x, y) not in self.damaged_blocks:
+            block = Block(block.type, x, y)
+            self.damaged_blocks[(x, y)] = block
+        
         if block.damage(damage):
             # Block destroyed - create particles
             self._create_break_particles(x, y, block.type)
@@ -247,31 +334,95 @@ class World:
         color = BLOCK_COLORS.get(block_type, (255, 255, 255))
         
         # Create 8-12 particles
-        num_particles = random.randint(8, 12)
-        for _ in range(num_particles):
-            particle = Particle(world_x, world_y, color)
-            self.particles.append(particle)
+        self.particles.emit(random.randint(8, 12), world_x, world_y, color, priority=PARTICLE_GAMEPLAY)
     
     def spawn_tnt(self, x, y, fuse_time=None, power_level=0):
-        """Spawn TNT at world position"""
+        """Spawn TNT at world position (returns None if the spot is solid)"""
         grid_x = int(x // BLOCK_SIZE)
         grid_y = int(y // BLOCK_SIZE)
         
         # Check if position is valid (but allow air)
-        block = self.get_block(grid_x, grid_y)
-        if block and block.is_solid():
+        if self.solid_grid.is_solid(grid_x, grid_y):
             return  # Can't spawn in solid block
         
-        tnt = TNT(x, y, fuse_time, power_level)
-        self.tnt_list.append(tnt)
+        tnt = self.tnt_pool.acquire(x, y, fuse_time, power_level, self.fuse_scheduler, self.tnt_store)
+        self.tnt_hash.insert(tnt)
         print(f"[TNT] Ignited at ({grid_x}, {grid_y}) with {tnt.fuse_time:.1f}s fuse, Power Level: {power_level}")
+        return tnt
+    
+    def sleep_tnt(self, tnt, support):
+        """Stop simulating a resting TNT until its support cell changes"""
+        tnt.sleeping = True
+        tnt.support = support
+        self.sleeping_tnt.setdefault(support, []).append(tnt)
+        self._count_support(support, 1)
+    
+    def wake_tnt(self, tnt):
+        """Resume physics for a TNT (knockback, explosion or lost support)"""
+        if not tnt.sleeping:
+            return
+        tnt.sleeping = False
+        resting = self.sleeping_tnt.get(tnt.support)
+        if resting:
+            resting.remove(tnt)
+            if not resting:
+                del self.sleeping_tnt[tnt.support]
+        self._count_support(tnt.support, -1)
+        tnt.support = None
+    
+    def sleep_item(self, item, supports):
+        """Stop simulating a resting item until one of its support cells changes"""
+        item.sleeping = True
+        item.supports = supports
+        for support in supports:
+            self.sleeping_items.setdefault(support, []).append(item)
+            self._count_support(support, 1)
+    
+    def wake_item(self, item):
+        """Resume physics for an item (lost support or removal)"""
+        if not item.sleeping:
+            return
+        item.sleeping = False
+        for support in item.supports:
+            resting = self.sleeping_items.get(support)
+            if resting:
+                resting.remove(item)
+                if not resting:
+                    del self.sleeping_items[support]
+            self._count_support(support, -1)
+        item.supports = None
+    
+    def _count_support(self, support, delta):
+        """Track how many sleepers rest on a cell (cells outside the world are never changed)"""
+        x, y = support
+        if 0 <= x < self.width and 0 <= y < self.height:
+            self.support_counts[x, y] += delta
+    
+    def _on_support_changed(self, xs, ys):
+        """Wake TNT and items resting on any changed cell and drop decals left in the air"""
+        self.particles.decals.drop_unsupported(xs, ys, self.solid_grid)
+        # Only changed cells something sleeps on need a dict lookup
+        touched = np.flatnonzero(self.support_counts[xs, ys])
+        for cell in zip(xs[touched].tolist(), ys[touched].tolist()):
+            for sleepers, wake in ((self.sleeping_tnt, self.wake_tnt), (self.sleeping_items, self.wake_item)):
+                for sleeper in list(sleepers.get(cell, ())):
+                    wake(sleeper)
     
     def spawn_item(self, x, y, item_type):
         """Spawn collectible item at world position"""
-        item = Item(x, y, item_type)
-        self.items.append(item)
+        item = self.item_pool.acquire(x, y, item_type, self.items)
+        self.item_hash.insert(item)
         print(f"[ITEM] Spawned {item_type} at ({int(x)}, {int(y)})")
     
+    def get_pool_stats(self):
+        """Object pool metrics per entity type"""
+        return {
+            'tnt': self.tnt_pool.get_stats(),
+            'item': self.item_pool.get_stats(),
+            'meteor': self.meteor_pool.get_stats(),
+            'explosion': self.explosion_pool.get_stats(),
+        }
+    
     def spawn_random_tnt_from_top(self, player_depth):
         """Spawn TNT from random position at top of screen"""
         # Calculate spawn chance based on depth
@@ -284,246 +435,47 @@ class World:
             spawn_x = random.randint(1, self.width - 2) * BLOCK_SIZE
             spawn_y = 0  # Top of world
             
-            # Spawn with random fuse time
-            self.spawn_tnt(spawn_x, spawn_y)
-            self.total_tnt_spawned += 1
+            # Spawn with random fuse time (counted once the spawner really places it)
+            self.tnt_spawner.request(spawn_x, spawn_y, on_spawn=self._count_sky_tnt)
             
             return True
         return False
     
-    def _explode_tnt(self, tnt, player=None, game=None):
-        """Handle TNT explosion"""
-        # Play explosion sound with distance-based volume
-        if SOUND_ENABLED:
-            volume = 1.0
-            if player:
-                # Calculate distance from player
-                distance = math.sqrt((tnt.x - player.x)**2 + (tnt.y - player.y)**2)
-                max_distance = 500  # Maximum hearing distance
-                volume = max(0.1, 1.0 - (distance / max_distance))
-            sound_gen.play_explosion(volume)
-        
-        center_x = int(tnt.x // BLOCK_SIZE)
-        center_y = int(tnt.y // BLOCK_SIZE)
-        
-        # Create explosion animation
-        explosion_x = center_x * BLOCK_SIZE + BLOCK_SIZE // 2
-        explosion_y = center_y * BLOCK_SIZE + BLOCK_SIZE // 2
-        self.explosions.append(Explosion(explosion_x, explosion_y))
-        
-        print(f"[TNT] BOOM at ({center_x}, {center_y})!")
-        
-        # Trigger screen shake and flash
-        if game:
-            # Shake intensity based on distance to player
-            if player:
-                dx = player.x - tnt.x
-                dy = player.y - tnt.y
-                distance_to_player = (dx * dx + dy * dy) ** 0.5
-                max_shake_distance = (TNT_EXPLOSION_RADIUS + 5) * BLOCK_SIZE
-                
-                if distance_to_player < max_shake_distance:
-                    shake_intensity = 15 * (1.0 - distance_to_player / max_shake_distance)
-                    game.trigger_screen_shake(shake_intensity, 0.3)
-            else:
-                game.trigger_screen_shake(10, 0.3)
-            
-            game.trigger_flash((255, 200, 100), 180)
-        
-        # Apply knockback to player if nearby
-        if player:
-            dx = player.x + player.width / 2 - (tnt.x + tnt.width / 2)
-            dy = player.y + player.height / 2 - (tnt.y + tnt.height / 2)
-            distance = (dx * dx + dy * dy) ** 0.5
-            
-            max_knockback_distance = (TNT_EXPLOSION_RADIUS + 2) * BLOCK_SIZE
-            
-            if distance < max_knockback_distance:
-                # Calculate knockback with improved physics
-                if distance > 0:
-                    # Normalize direction
-                    dir_x = dx / distance
-                    dir_y = dy / distance
-                    
-                    # Force decreases with distance (inverse square law, but clamped)
-                    distance_ratio = 1.0 - (distance / max_knockback_distance)
-                    force_multiplier = distance_ratio ** 0.7  # Power < 1 for smoother falloff
-                    
-                    # Base force
-                    base_force = TNT_KNOCKBACK_FORCE
-                    
-                    # Apply force with upward bias (launch effect)
-                    knockback_x = dir_x * base_force * force_multiplier
-                    knockback_y = dir_y * base_force * force_multiplier
-                    
-                    # Add extra upward force for dramatic effect
-                    if knockback_y > 0:  # If pushing down, reduce it
-                        knockback_y *= 0.5
-                    else:  # If pushing up, enhance it
-                        knockback_y *= 1.5
-                    
-                    # Ensure minimum upward component
-                    knockback_y = min(knockback_y, -base_force * 0.3)
-                    
-                    # Variable hurt duration based on distance
-                    hurt_duration = 0.5 + (0.5 * distance_ratio)  # 0.5-1.0 seconds
-                    
-                    # Calculate damage based on TNT power level (1 base damage + 1 per 2 levels)
-                    tnt_damage = 1 + (tnt.power_level // 2)
-                    
-                    player.apply_knockback(knockback_x, knockback_y, hurt_duration, damage=tnt_damage)
-                    print(f"[TNT] Player launched! Distance: {distance:.1f}, Force: ({knockback_x:.1f}, {knockback_y:.1f}), Hurt: {hurt_duration:.1f}s, Damage: {tnt_damage}")
-                else:
-                    # Direct hit - maximum force and damage
-                    tnt_damage = 2 + (tnt.power_level // 2)
-                    player.apply_knockback(0, -TNT_KNOCKBACK_FORCE * 1.5, 1.0, damage=tnt_damage)
-                    print(f"[TNT] DIRECT HIT! Maximum knockback! Damage: {tnt_damage}")
-        
-        # Apply knockback to nearby TNT entities (chain reaction)
-        tnt_knockback_radius = (TNT_EXPLOSION_RADIUS + 3) * BLOCK_SIZE
-        for other_tnt in self.tnt_list:
-            if other_tnt is tnt:  # Skip the exploding TNT itself
-                continue
-                
-            # Calculate distance from explosion center
-            dx = other_tnt.x - tnt.x
-            dy = other_tnt.y - tnt.y
-            distance = (dx * dx + dy * dy) ** 0.5
-            
-            if distance < tnt_knockback_radius and distance > 0:
-                # Calculate knockback force
-                dir_x = dx / distance
-                dir_y = dy / distance
-                
-                # Force decreases with distance
-                distance_ratio = 1.0 - (distance / tnt_knockback_radius)
-                force_multiplier = distance_ratio ** 0.5
-                
-                # TNT gets stronger knockback than player
-                base_force = TNT_KNOCKBACK_FORCE * 2.5
-                
-                # Apply force with upward bias
-                knockback_x = dir_x * base_force * force_multiplier
-                knockback_y = dir_y * base_force * force_multiplier
-                
-                # Add upward component to make TNT fly
-                if knockback_y > 0:  # If pushing down
-                    knockback_y *= 0.3
-                else:  # If pushing up
-                    knockback_y *= 1.2
-                
-                # Ensure minimum upward component
-                knockback_y = min(knockback_y, -base_force * 0.4)
-                
-                # Apply velocity to TNT
-                other_tnt.velocity_x = knockback_x
-                other_tnt.velocity_y = knockback_y
-                other_tnt.is_falling = True
-                other_tnt.on_ground = False
-                
-                # Reduce fuse time slightly to create cascading effect
-                other_tnt.fuse_time = min(other_tnt.fuse_time, random.uniform(1.0, 2.5))
-                
-                print(f"[TNT] Chain reaction! Pushed TNT at distance {distance:.1f}, Force: ({knockback_x:.1f}, {knockback_y:.1f}), New fuse: {other_tnt.fuse_time:.1f}s")
-        
-        # Destroy blocks in radius (with TNT power bonus)
-        destroyed_count = 0
-        
-        # Calculate boosted radius from player's TNT power level
-        base_radius = TNT_EXPLOSION_RADIUS
-        if player:
-            radius_bonus = int(player.tnt_power_level * 0.5)  # +0.5 blocks per level
-            explosion_radius = base_radius + radius_bonus
-            print(f"[TNT] Explosion radius: {explosion_radius} (base: {base_radius}, bonus: +{radius_bonus})")
-        else:
-            explosion_radius = base_radius
-        
-        for dy in range(-explosion_radius, explosion_radius + 1):
-            for dx in range(-explosion_radius, explosion_radius + 1):
-                # Check if in circular radius
-                distance = (dx * dx + dy * dy) ** 0.5
-                if distance <= explosion_radius:
-                    bx = center_x + dx
-                    by = center_y + dy
-                    
-                    block = self.get_block(bx, by)
-                    if block and block.is_mineable():
-                        self._create_break_particles(bx, by, block.type)
-                        self.set_block(bx, by, 'air')
-                        destroyed_count += 1
-        
-        # Create colored explosion particles based on TNT power level
-        if tnt.power_level >= 5:
-            particle_colors = [(255, 100, 255), (200, 0, 255), (255, 0, 200)]  # Pink/Purple
-        elif tnt.power_level >= 2:
-            particle_colors = [(150, 0, 255), (200, 50, 255), (100, 0, 200)]  # Purple
-        else:
-            particle_colors = [(255, 100, 0), (255, 150, 0), (255, 200, 0)]  # Orange/Yellow
-        
-        # Particle count increases with power level
-        particle_count = 30 + (tnt.power_level * 10)
-        for _ in range(particle_count):
-            color = particle_colors[_ % len(particle_colors)]
-            particle = Particle(tnt.x, tnt.y, color)
-            particle.velocity_x = random.uniform(-200, 200) * (1 + tnt.power_level * 0.2)
-            particle.velocity_y = random.uniform(-200, 200) * (1 + tnt.power_level * 0.2)
-            particle.lifetime = 1.0 + (tnt.power_level * 0.2)
-            self.particles.append(particle)
-        
-        print(f"Explosion destroyed {destroyed_count} blocks")
-        
-        # Trigger screen effects if game reference provided
-        if game:
-            game.explosion_flash = 0.5
-            game.screen_shake = 10 * (1 + tnt.power_level * 0.3)
-        
-        # RARE ITEM DROPS from TNT! 
-        drop_chance = random.random()
-        if drop_chance < 0.10:  # 10% chance to drop rare item (reduced from 30%)
-            rare_items = ['magnet', 'double_jump', 'speed_boost', 'shield', 'block_breaker']
-            item_type = random.choice(rare_items)
-            
-            # Spawn item at explosion location with upward velocity
-            item_x = tnt.x + random.uniform(-BLOCK_SIZE, BLOCK_SIZE)
-            item_y = tnt.y - BLOCK_SIZE * 2  # Spawn above explosion
-            
-            self.spawn_item(item_x, item_y, item_type)
-            print(f"[RARE DROP] {item_type}!")
-            
-            # Extra particles for item drop
-            for _ in range(20):
-                particle = Particle(item_x, item_y, (255, 255, 0))  # Gold sparkles
-                particle.velocity_x = random.uniform(-100, 100)
-                particle.velocity_y = random.uniform(-150, -50)
-                particle.lifetime = 0.8
-                self.particles.append(particle)
-        
-        # 5% chance to drop heart item (reduced from 15%)
-        elif drop_chance < 0.15:
-            item_x = tnt.x + random.uniform(-BLOCK_SIZE, BLOCK_SIZE)
-            item_y = tnt.y - BLOCK_SIZE * 2
-            self.spawn_item(item_x, item_y, 'heart')
-            print(f"[HEART DROP] Heart item!")
-        
-        # Check for chain reactions
-        self._check_chain_reaction(center_x, center_y)
-    
-    def _check_chain_reaction(self, x, y):
-        """Check if explosion triggers nearby TNT"""
-        for tnt in self.tnt_list[:]:  # Copy list to avoid modification during iteration
-            tnt_x = int(tnt.x // BLOCK_SIZE)
-            tnt_y = int(tnt.y // BLOCK_SIZE)
-            
-            distance = ((tnt_x - x) ** 2 + (tnt_y - y) ** 2) ** 0.5
-            if distance <= TNT_EXPLOSION_RADIUS + 1:
-                # Trigger this TNT immediately
-                tnt.fuse_time = 0
+    def _count_sky_tnt(self, tnt):
+        """Count a TNT from the sky that actually appeared"""
+        self.total_tnt_spawned += 1
+    
+    def _drop_crater_ores(self, crater, max_drops=EXPLOSION_MAX_ORE_DROPS):
+        """Drop a few ore items from ore blocks destroyed by an explosion"""
+        ore_ids = [BLOCK_IDS[ore] for ore in ['coal', 'iron', 'gold', 'diamond']]
+        ore_cells = np.nonzero(np.isin(crater['ids'], ore_ids))[0]
+        if len(ore_cells) > max_drops:
+            ore_cells = np.random.choice(ore_cells, max_drops, replace=False)
+        
+        for i in ore_cells.tolist():
+            block_type = BLOCK_TYPES[crater['ids'][i]]
+            item_x = int(crater['xs'][i]) * BLOCK_SIZE + BLOCK_SIZE // 2
+            item_y = int(crater['ys'][i]) * BLOCK_SIZE
+            self.spawn_item(item_x, item_y, block_type + '_ore')
     
     def update(self, dt, player=None, game=None):
         """Update TNT and particles"""
+        # Particle budget and update LOD treat things away from the camera as off screen
+        if game:
+            self.particles.budget.set_view(game.camera_x, game.camera_y)
+            self.update_lod.set_view(game.camera_x, game.camera_y)
+        elif player:
+            self.particles.budget.set_view(player.x - SCREEN_WIDTH // 2, player.y - SCREEN_HEIGHT // 2)
+            self.update_lod.set_view(player.x - SCREEN_WIDTH // 2, player.y - SCREEN_HEIGHT // 2)
+        lod = self.update_lod
+        lod.advance()
+        
         # Update meteor shower system
         self._update_meteor_shower(dt, player)
         
+        # Let unsupported sand fall
+        self.falling_blocks.update(dt)
+        
         # Update TNT spawn timer
         self.tnt_spawn_timer += dt
         if self.tnt_spawn_timer >= self.tnt_spawn_interval:
@@ -536,95 +488,153 @@ class World:
                     # Vary next spawn interval slightly
                     self.tnt_spawn_interval = TNT_SPAWN_INTERVAL + random.uniform(-1.0, 1.0)
         
-        # Update TNT
-        for tnt in self.tnt_list[:]:
-            tnt.update(dt, self)
-            
-            if tnt.should_explode():
-                self._explode_tnt(tnt, player, game)
-                self.tnt_list.remove(tnt)
-        
-        # Update particles
-        for particle in self.particles[:]:
-            particle.update(dt)
-            if particle.is_dead():
-                self.particles.remove(particle)
+        # Admit queued TNT requests into free slots
+        self.tnt_spawner.update()
+        
+        # Update awake TNT in vectorized batches - sleeping TNT costs nothing until woken,
+        # far TNT ticks every few frames with the time it waited
+        store = self.tnt_store
+        for batch_dt, slots in lod.schedule(store, dt, ~store.sleeping[:store.count]):
+            for tnt in store.get_owners(store.update(batch_dt, self, slots)):
+                self.tnt_hash.move(tnt)  # Only TNT that was integrated can have changed cell
+        
+        # Fuses that ran out this frame are resolved as one batch (deadlines ignore the LOD)
+        self.fuse_scheduler.advance(dt)
+        detonating = self.fuse_scheduler.pop_due()
+        if detonating:
+            # Far TNT catches up on the motion it still owes so it blows up where it should be
+            for tnt in detonating:
+                if tnt.store is store and tnt.lod_dt > 0 and not tnt.sleeping:
+                    store.update(tnt.lod_dt, self, np.array([tnt.slot]))
+                    tnt.lod_dt = 0
+                    self.tnt_hash.move(tnt)
+            self.explosion_resolver.resolve(detonating, player, game)
+        
+        # Spread queued particles, animations and drops over frames
+        self.effect_queue.drain()
+        
+        # Update particles and decorative effects (one vectorized step each)
+        self.particles.update(dt, self.solid_grid)
+        self.effects.update(dt)
         
         # Update explosions
-        for explosion in self.explosions[:]:
+        finished = False
+        for explosion in self.explosions:
             explosion.update(dt)
-            if explosion.is_finished():
-                self.explosions.remove(explosion)
-        
-        # Update items
-        for item in self.items[:]:
-            item.update(dt, self)
+            finished = finished or explosion.is_finished()
+        if finished:
+            for explosion in self.explosions:
+                if explosion.is_finished():
+                    self.explosion_pool.release(explosion)
+            self.explosions = [explosion for explosion in self.explosions if not explosion.is_finished()]
+        
+        # Update items in batches (far ones less often) - only expired and falling ones need more work
+        self.items.advance(dt)
+        expired, moved, landed = [], [], []
+        for batch_dt, slots in lod.schedule(self.items, dt):
+            batch_expired, batch_moved, batch_landed = self.items.update(batch_dt, self, slots)
+            expired += batch_expired
+            moved += batch_moved
+            landed += batch_landed
+        for item in expired:
+            print(f"[ITEM] {item.item_type} disappeared (not collected)")
+            self._remove_item(item)
+        for item in moved:
+            self.item_hash.move(item)
+        
+        # Identical drops that settle close together become one stack
+        self._stack_landed_items(landed)
+        
+        # Check if player collects items - only those near the player
+        if player and self.items:
+            center_x = player.x + player.width / 2
+            center_y = player.y + player.height / 2
+            reach = BLOCK_SIZE * 3  # Collect radius (1.5 blocks) plus the item's top-left offset
+            for item in self.item_hash.query_radius(center_x, center_y, reach):
+                if item.can_collect(player):
+                    self._collect_item(item, player)
+        
+        # Update meteors (the ones that hit something impact)
+        impacts = []
+        for batch_dt, slots in lod.schedule(self.meteors, dt):
+            impacts += self.meteors.update(batch_dt, self, slots)
+        for meteor in impacts:
+            self._meteor_impact(meteor)
+            self.meteors.remove(meteor)
+            self.meteor_pool.release(meteor)
+    
+    def _remove_item(self, item):
+        """Drop an item from the world"""
+        self.wake_item(item)
+        self.items.remove(item)
+        self.item_hash.remove(item)
+        self.item_pool.release(item)
+    
+    def _collect_item(self, item, player):
+        """Apply a collected item (its whole stack) to the player and remove it"""
+        count = item.stack
+        print(f"[ITEM] Player collected {item.item_type} x{count}!")
+        
+        # Track in statistics (get game reference from player if available)
+        if hasattr(player, 'game') and player.game and hasattr(player.game, 'stats'):
+            player.game.stats.on_item_collected(item.item_type, count)
+        
+        # Special item: Heart (increases max HP)
+        if item.item_type == 'heart':
+            player.max_hp += count
+            player.current_hp += count  # Also heal
+            print(f"[HEART] +{count} Max HP! Total: {player.max_hp}")
+        
+        # Ore items (coal, iron, gold, diamond) - just collect for score
+        elif item.item_type in ['coal_ore', 'iron_ore', 'gold_ore', 'diamond_ore']:
+            ore_name = item.item_type.replace('_ore', '').upper()
+            print(f"[COLLECT] {ore_name} x{count} collected!")
+        
+        # Crystal and rare ore upgrade TNT power
+        elif item.item_type in ['crystal', 'rare_ore']:
+            player.tnt_power_level += count
+            player.tnt_power_bonus = player.tnt_power_level * 0.10
+            bonus_percent = int(player.tnt_power_bonus * 100)
+            print(f"[TNT POWER] +{count} TNT Power Level! Level: {player.tnt_power_level} | Bonus: +{bonus_percent}%")
             
-            # Remove expired items
-            if item.lifetime <= 0:
-                print(f"[ITEM] {item.item_type} disappeared (not collected)")
-                self.items.remove(item)
-                continue
+            # Also heal 1 HP per item
+            self._heal_player(player, count)
+        
+        # Level up mining speed for rare items (excluding crystal/rare_ore)
+        elif item.is_rare:
+            player.mining_level += count
+            player.level_up_flash = 0.5  # Flash effect for 0.5 seconds
+            # Recalculate bonus immediately to show correct value
+            player.mining_speed_bonus = min(2.0, player.mining_level * 0.10)
+            bonus_percent = int(player.mining_speed_bonus * 100)
+            print(f"[LEVEL UP] Mining Level: {player.mining_level} | Speed Bonus: +{bonus_percent}%")
             
-            # Check if player collects item
-            if player and item.can_collect(player):
-                print(f"[ITEM] Player collected {item.item_type}!")
-                
-                # Track in statistics (get game reference from player if available)
-                if hasattr(player, 'game') and player.game and hasattr(player.game, 'stats'):
-                    player.game.stats.on_item_collected(item.item_type)
-                
-                # Special item: Heart (increases max HP)
-                if item.item_type == 'heart':
-                    player.max_hp += 1
-                    player.current_hp += 1  # Also heal
-                    print(f"[HEART] +1 Max HP! Total: {player.max_hp}")
-                
-                # Ore items (coal, iron, gold, diamond) - just collect for score
-                elif item.item_type in ['coal_ore', 'iron_ore', 'gold_ore', 'diamond_ore']:
-                    ore_name = item.item_type.replace('_ore', '').upper()
-                    print(f"[COLLECT] {ore_name} collected!")
-                
-                # Crystal and rare ore upgrade TNT power
-                elif item.item_type in ['crystal', 'rare_ore']:
-                    player.tnt_power_level += 1
-                    player.tnt_power_bonus = player.tnt_power_level * 0.10
-                    bonus_percent = int(player.tnt_power_bonus * 100)
-                    print(f"[TNT POWER] +1 TNT Power Level! Level: {player.tnt_power_level} | Bonus: +{bonus_percent}%")
-                    
-                    # Also heal 1 HP
-                    if player.current_hp < player.max_hp:
-                        player.current_hp += 1
-                        print(f"[HP] HP Restored! Current HP: {player.current_hp}/{player.max_hp}")
-                
-                # Level up mining speed for rare items (excluding crystal/rare_ore)
-                elif item.is_rare:
-                    player.mining_level += 1
-                    player.level_up_flash = 0.5  # Flash effect for 0.5 seconds
-                    # Recalculate bonus immediately to show correct value
-                    player.mining_speed_bonus = min(2.0, player.mining_level * 0.10)
-                    bonus_percent = int(player.mining_speed_bonus * 100)
-                    print(f"[LEVEL UP] Mining Level: {player.mining_level} | Speed Bonus: +{bonus_percent}%")
-                    
-                    # Increase max HP on level up (every level)
-                    player.max_hp += 1
-                    print(f"[HEART] +1 Max HP from level up! Total: {player.max_hp}")
-                    
-                    # Heal 1 HP when collecting rare items
-                    if player.current_hp < player.max_hp:
-                        player.current_hp += 1
-                        print(f"[HP] HP Restored! Current HP: {player.current_hp}/{player.max_hp}")
-                
-                self.items.remove(item)
-        
-        # Update meteors
-        for meteor in self.meteors[:]:
-            meteor.update(dt)
+            # Increase max HP on level up (every level)
+            player.max_hp += count
+            print(f"[HEART] +{count} Max HP from level up! Total: {player.max_hp}")
             
-            # Check if meteor should impact
-            if meteor.should_impact(self):
-                self._meteor_impact(meteor)
-                self.meteors.remove(meteor)
+            # Heal 1 HP per rare item collected
+            self._heal_player(player, count)
+        
+        self._remove_item(item)
+    
+    def _heal_player(self, player, amount):
+        """Restore up to amount HP (never above max)"""
+        healed = min(amount, player.max_hp - player.current_hp)
+        if healed > 0:
+            player.current_hp += healed
+            print(f"[HP] HP Restored! Current HP: {player.current_hp}/{player.max_hp}")
+    
+    def _stack_landed_items(self, landed):
+        """Merge items that came to rest into a resting stack of the same type nearby"""
+        for item in landed:
+            if item.store is not self.items:
+                continue  # Already merged into another stack this frame
+            for other in self.item_hash.query_radius(item.x, item.y, ITEM_STACK_RADIUS):
+                if other.can_stack_with(item):
+                    other.absorb(item)
+                    self._remove_item(item)
+                    break
     
     def get_visible_blocks(self, camera_x, camera_y, screen_width, screen_height):
         """Get blocks visible on screen for efficient rendering"""
@@ -633,12 +643,14 @@ class World:
         end_x = min(self.width, int((camera_x + screen_width) // BLOCK_SIZE) + 2)
         end_y = min(self.height, int((camera_y + screen_height) // BLOCK_SIZE) + 2)
         
+        window = self.block_grid[start_x:end_x, start_y:end_y]
+        xs, ys = np.nonzero(window)
+        ids = window[xs, ys].tolist()
+        
         visible = []
-        for y in range(start_y, end_y):
-            for x in range(start_x, end_x):
-                block = self.get_block(x, y)
-                if block:
-                    visible.append((x, y, block))
+        damaged = self.damaged_blocks
+        for x, y, block_id in zip((xs + start_x).tolist(), (ys + start_y).tolist(), ids):
+            visible.append((x, y, damaged.get((x, y)) or SHARED_BLOCKS[block_id]))
         
         return visible
 
@@ -688,8 +700,7 @@ class World:
         
         spawn_y = -20  # Above screen
         
-        meteor = Meteor(spawn_x, spawn_y)
-        self.meteors.append(meteor)
+        self.meteor_pool.acquire(spawn_x, spawn_y, self.meteors)
     
     def _meteor_impact(self, meteor):
         """Handle meteor impact with ground"""
@@ -708,18 +719,17 @@ class World:
         
         # Create beautiful impact particles
         impact_particles = meteor.create_impact_particles()
-        for particle_data in impact_particles:
-            particle = Particle(
-                particle_data['x'], 
-                particle_data['y'],
-                meteor.get_color_rgb()
-            )
-            # Override velocity with custom values
-            particle.velocity_x = particle_data['vx']
-            particle.velocity_y = particle_data['vy']
-            particle.lifetime = particle_data['life']
-            particle.max_lifetime = particle_data['max_life']
-            self.particles.append(particle)
+        self.particles.emit(
+            len(impact_particles),
+            [p['x'] for p in impact_particles],
+            [p['y'] for p in impact_particles],
+            meteor.get_color_rgb(),
+            velocity_x=[p['vx'] for p in impact_particles],
+            velocity_y=[p['vy'] for p in impact_particles],
+            lifetime=[p['life'] for p in impact_particles],
+            max_lifetime=[p['max_life'] for p in impact_particles],
+            priority=PARTICLE_AMBIENT
+        )
         
         # Spawn rare items (crystal or rare ore) - guaranteed drop!
         spawn_chance = random.random()